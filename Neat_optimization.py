@@ -12,6 +12,7 @@ import neat
 sys.path.insert(0, "evoman")
 from environment import Environment
 from specialist_controller import NEAT_Controls
+from parallel_evaluation import ParallelGenomeEvaluator, common_seeds
 import pickle
 
 
@@ -22,40 +23,45 @@ if headless:
 
 n_hidden_neurons = 10
 
+# number of worker processes evaluating genomes (1 evaluates serially, with the same seeds)
+n_processes = os.cpu_count()
 
-# runs simulation
-def simulation(env, x):
-    f, p, e, t = env.play(pcont=x)
-    return f
+# common random numbers: every genome of a generation plays the same n_seeds games (new
+# ones every generation) and its fitness is their 'statistic' (np.mean, np.median,
+# np.min...). with 0, every genome plays one game seeded from its key
+n_seeds = 0
+statistic = np.mean
+
+experiment_name = "Neat_enemies_78"
 
 
-# funtcion to evaluate fitness and save needed outputs
-def eval_genomes(genomes, config):
-    generation = []
-    global gen
-    for genome_id, genome in genomes:
-        genome.fitness = 0
-        genome.fitness = simulation(env, genome)
-        generation.append(genome.fitness)
-    fitness_gens.append(np.mean(generation))
-    fitness_max.append(np.max(generation))
-    fitness_std.append(np.std(generation))
-    file_aux = open(f"{experiment_name}/EXP_{i+1}" + "/results.txt", "a")
-    file_aux.write("\ngen best mean std")
-    file_aux.write(
-        f"\ngen-{gen}: "
-        + str((fitness_max[-1]))
-        + " "
-        + str((fitness_gens[-1]))
-        + " "
-        + str((fitness_std[-1]))
+# initializes simulation in individual evolution mode, for single static enemy.
+# every worker process of the evaluator builds its own environment with this;
+# only the main one writes the log file, so workers do not truncate it when they start
+def make_env(savelogs="no"):
+    return Environment(
+        experiment_name=experiment_name,
+        enemies=[7, 8],
+        playermode="ai",
+        player_controller=NEAT_Controls(),
+        enemymode="static",
+        level=2,
+        speed="fastest",
+        multiplemode="yes",
+        randomini="yes",
+        render="none",
+        savelogs=savelogs,
     )
-    file_aux.close()
-    gen = gen + 1
+
+
+# runs simulation
+def simulation(x, env):
+    f, p, e, t = env.play(pcont=x)
+    return f
 
 
 # Main part of the algorithm, it runs the NEAT algo
-def run(config_file):
+def run(config_file, run_dir):
     """
     It uses the config file named config-feedforward.txt
     """
@@ -76,11 +82,34 @@ def run(config_file):
     p.add_reporter(stats)
     p.add_reporter(neat.Checkpointer(5))
 
+    # evaluates the genomes in parallel and saves needed outputs
+    evaluator = ParallelGenomeEvaluator(
+        make_env, simulation, processes=n_processes, statistic=statistic
+    )
+
+    def eval_genomes(genomes, config):
+        if n_seeds:
+            evaluator.seeds = common_seeds(n_seeds, len(evaluator.stats))
+        evaluator(genomes, config)
+        fitness_max, fitness_mean, fitness_std = evaluator.stats[-1]
+        file_aux = open(run_dir + "/results.txt", "a")
+        file_aux.write("\ngen best mean std")
+        file_aux.write(
+            f"\ngen-{len(evaluator.stats) - 1}: "
+            + str(fitness_max)
+            + " "
+            + str(fitness_mean)
+            + " "
+            + str(fitness_std)
+        )
+        file_aux.close()
+
     # Run for up to 25 generations.
     winner = p.run(eval_genomes, 25)
+    evaluator.close()
 
     # Save the best solution with pickle
-    with open(f"{experiment_name}/EXP_{i+1}/winner.pkl", "wb") as f:
+    with open(f"{run_dir}/winner.pkl", "wb") as f:
         pickle.dump(winner, f)
         f.close()
     # show final stats
@@ -91,7 +120,6 @@ if __name__ == "__main__":
 
     N_runs = 10
 
-    experiment_name = "Neat_enemies_78"
     # create directory if it does not exist yet
     if not os.path.exists(experiment_name):
         os.makedirs(experiment_name)
@@ -100,29 +128,11 @@ if __name__ == "__main__":
     local_dir = os.path.dirname(__file__)
     config_path = os.path.join(local_dir, "config-feedforward.txt")
 
-    # initializes simulation in individual evolution mode, for single static enemy.
-    env = Environment(
-        experiment_name=experiment_name,
-        enemies=[7, 8],
-        playermode="ai",
-        player_controller=NEAT_Controls(),
-        enemymode="static",
-        level=2,
-        speed="fastest",
-        multiplemode="yes",
-        randomini="yes",
-    )
+    env = make_env(savelogs="yes")
 
     # default environment fitness is assumed for experiment
     env.state_to_log()  # checks environment state
     for i in range(N_runs):
         if not os.path.exists(f"{experiment_name}/EXP_{i+1}"):
             os.makedirs(f"{experiment_name}/EXP_{i+1}")
-        # global variables for saving mean and max each generation
-        fitness_gens = []
-        fitness_max = []
-        fitness_gens = []
-        fitness_max = []
-        fitness_std = []
-        gen = 0
-        run(config_path)
+        run(config_path, f"{experiment_name}/EXP_{i+1}")
@@ -0,0 +1,246 @@
+# measures how fast the framework evaluates, so regressions can be tracked between versions.
+# it plays the saved solutions (best.txt of the DEAP runs, winner.pkl of the NEAT runs):
+#  - episodes: every solution against every enemy, reporting frames/sec and episodes/sec
+#    per controller type and render mode.
+#  - generations: a population made of the saved solutions evaluated as the drivers do
+#    (ea1_deap.py and Neat_optimization.py), reporting the wall time of a generation per
+#    controller type, render mode and number of worker processes.
+# results are written as JSON.
+import sys, os
+
+sys.path.insert(0, "evoman")
+
+# not using visuals, also when measuring the rendering ("display") mode
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+from environment import Environment
+from batch_environment import BatchEnvironment
+from demo_controller import player_controller
+from specialist_controller import NEAT_Controls
+from parallel_evaluation import ParallelEvaluator, ParallelGenomeEvaluator
+from functools import partial
+import numpy as np
+import platform
+import subprocess
+import pygame
+import pickle
+import neat
+import glob
+import json
+import time
+
+
+n_hidden_neurons = 10
+experiment_name = "benchmark"
+
+
+# builds the player controller of a type: "demo" (the DEAP driver one, demo_controller)
+# or "neat"/"numpy" (NEAT_Controls with either network implementation)
+def make_controller(controller):
+    if controller == "demo":
+        return player_controller(n_hidden_neurons)
+    return NEAT_Controls(network=controller)
+
+
+def make_env(controller, render, enemies, multiplemode="no"):
+    return Environment(
+        experiment_name=experiment_name,
+        enemies=enemies,
+        multiplemode=multiplemode,
+        playermode="ai",
+        player_controller=make_controller(controller),
+        enemymode="static",
+        level=2,
+        speed="fastest",
+        randomini="yes",
+        logs="off",
+        savelogs="no",
+        render=render,
+    )
+
+
+# evaluation function given to the parallel evaluators
+def simulation(x, env):
+    f, p, e, t = env.play(pcont=x)
+    return f
+
+
+def load_solutions():
+    solutions = {}
+    solutions["demo"] = [
+        np.loadtxt(f) for f in sorted(glob.glob("ea1_deap_enemies*_new/*/best.txt"))
+    ]
+    genomes = []
+    for f in sorted(glob.glob("Neat_enemies_*/*/winner.pkl")):
+        with open(f, "rb") as pkl:
+            genomes.append(pickle.load(pkl))
+    solutions["neat"] = solutions["numpy"] = genomes
+    return solutions
+
+
+# plays every solution once against every enemy (a fixed seed per game)
+def bench_episodes(controller, render, solutions, enemies):
+
+    env = make_env(controller, render, [enemies[0]])
+    results = []
+    for enemy in enemies:
+        frames = 0
+        start = time.perf_counter()
+        for i, solution in enumerate(solutions):
+            np.random.seed(i)
+            f, p, e, t = env.run_single(enemy, solution, None)
+            frames += env.time
+        seconds = time.perf_counter() - start
+
+        results.append(
+            {
+                "controller": controller,
+                "render": render,
+                "enemy": enemy,
+                "episodes": len(solutions),
+                "frames": frames,
+                "seconds": seconds,
+                "frames_per_sec": frames / seconds,
+                "episodes_per_sec": len(solutions) / seconds,
+            }
+        )
+    return results
+
+
+# evaluates generations of 'population' with a driver's evaluator. the first generation
+# (starting the worker processes and building their environments) is timed apart.
+# processes=None uses the batched environment instead of worker processes.
+def bench_generations(controller, render, population, enemies, processes, generations):
+
+    env_factory = partial(make_env, controller, render, enemies, "yes")
+    if processes is None:
+        evaluator = BatchEnvironment(
+            len(population),
+            player_controller=make_controller(controller),
+            experiment_name=experiment_name,
+            enemies=enemies,
+            multiplemode="yes",
+            enemymode="static",
+            level=2,
+            speed="fastest",
+            randomini="yes",
+            logs="off",
+            savelogs="no",
+        )
+        evaluate = evaluator.play
+    elif controller == "demo":
+        evaluator = ParallelEvaluator(env_factory, processes=processes)
+        evaluate = partial(evaluator.map, simulation)
+    else:
+        evaluator = ParallelGenomeEvaluator(env_factory, simulation, processes=processes)
+        config = make_controller(controller).config
+
+        def evaluate(population):
+            evaluator(list(enumerate(population)), config)
+
+    times = []
+    for g in range(generations + 1):
+        start = time.perf_counter()
+        evaluate(population)
+        times.append(time.perf_counter() - start)
+
+    if processes is not None:
+        evaluator.close()
+
+    episodes = len(population) * len(enemies)
+    seconds = float(np.mean(times[1:]))
+    return {
+        "controller": controller,
+        "render": render,
+        "processes": processes if processes is not None else "batch",
+        "population": len(population),
+        "enemies": enemies,
+        "generations": generations,
+        "first_generation_seconds": times[0],
+        "seconds_per_generation": seconds,
+        "episodes_per_sec": episodes / seconds,
+    }
+
+
+def versions():
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pygame": pygame.version.ver,
+        "neat": getattr(neat, "__version__", None),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+if __name__ == "__main__":
+
+    # CONFIGURATION
+    output_file = "benchmark.json"
+    controllers = ["demo", "neat", "numpy"]
+    renders = ["none", "display"]
+    enemies = [1, 2, 3, 4, 5, 6, 7, 8]
+    generation_enemies = {"demo": [2, 7, 8], "neat": [7, 8], "numpy": [7, 8]}
+    processes = sorted(set([1, os.cpu_count()]))  # worker counts for the generations
+    generations = 2  # timed generations, after the first one
+
+    if not os.path.exists(experiment_name):
+        os.makedirs(experiment_name)
+
+    solutions = load_solutions()
+
+    report = {"versions": versions(), "episodes": [], "generations": []}
+    for controller in controllers:
+        for render in renders:
+            report["episodes"] += bench_episodes(
+                controller, render, solutions[controller], enemies
+            )
+            print(controller, render, "episodes done")
+
+            for n in processes:
+                report["generations"].append(
+                    bench_generations(
+                        controller,
+                        render,
+                        solutions[controller],
+                        generation_enemies[controller],
+                        n,
+                        generations,
+                    )
+                )
+            print(controller, render, "generations done")
+
+        # the batched environment is always headless, and batches only the demo controller
+        if controller == "demo":
+            report["generations"].append(
+                bench_generations(
+                    controller,
+                    "none",
+                    solutions[controller],
+                    generation_enemies[controller],
+                    None,
+                    generations,
+                )
+            )
+
+    with open(output_file, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for result in report["episodes"]:
+        print(
+            "episodes %(controller)s %(render)s enemy %(enemy)d: "
+            "%(frames_per_sec).0f frames/s, %(episodes_per_sec).1f episodes/s" % result
+        )
+    for result in report["generations"]:
+        print(
+            "generation %(controller)s %(render)s processes %(processes)s: "
+            "%(seconds_per_generation).2f s, %(episodes_per_sec).1f episodes/s" % result
+        )
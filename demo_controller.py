@@ -18,33 +18,131 @@ class player_controller(Controller):
         # Number of hidden neurons
         self.n_hidden = [_n_hidden]
 
-    def control(self, inputs, controller):
-        # Normalises the input using min-max scaling
-        inputs = (inputs - min(inputs)) / float((max(inputs) - min(inputs)))
+        # last genome decoded by control, a copy of its genes and its weights
+        self.genome = None
+        self.genome_copy = None
+        self.weights = None
+
+        # last population decoded by control_batch, a copy of its genes and its weights,
+        # and whether it was fixed by set_batch
+        self.batch_population = None
+        self.batch_copy = None
+        self.batch_weights = None
+        self.batch_fixed = False
+
+    # decodes a whole population (one genome per row) into stacked weights and biases
+    def decode_batch(self, population, n_inputs):
+        population = np.asarray(population)
+        n_pop = population.shape[0]
+
+        if self.n_hidden[0] > 0:
+            n_hidden = self.n_hidden[0]
+            weights1_slice = n_inputs * n_hidden + n_hidden
+
+            bias1 = population[:, :n_hidden]
+            weights1 = population[:, n_hidden:weights1_slice].reshape(
+                (n_pop, n_inputs, n_hidden)
+            )
+            bias2 = population[:, weights1_slice : weights1_slice + 5]
+            weights2 = population[:, weights1_slice + 5 :].reshape((n_pop, n_hidden, 5))
+            return bias1, weights1, bias2, weights2
+        else:
+            bias = population[:, :5]
+            weights = population[:, 5:].reshape((n_pop, n_inputs, 5))
+            return bias, weights
+
+    # fixes the population of the next control_batch calls (e.g. for a whole batch of
+    # games, whose genes do not change): it is decoded once, and then only recognised by
+    # identity, not compared gene by gene every call. set_batch(None) releases it.
+    def set_batch(self, population):
+        self.batch_population = population
+        self.batch_copy = None
+        if population is not None:
+            self.batch_copy = np.array(population, dtype=float)
+        self.batch_weights = None
+        self.batch_fixed = population is not None
+
+    # decides the actions of a whole population at once: row i of 'inputs' (one row per
+    # individual) goes through the network of genome i. Returns a (population, 5) array.
+    # The population is decoded again only when it changes, as in 'control' (unless it
+    # was fixed by set_batch).
+    def control_batch(self, inputs, population):
+        if population is not self.batch_population or not (
+            self.batch_fixed or np.array_equal(population, self.batch_copy)
+        ):
+            self.batch_population = population
+            self.batch_copy = np.array(population, dtype=float)
+            self.batch_weights = None
+            self.batch_fixed = False
+
+        if self.batch_weights is None:
+            self.batch_weights = self.decode_batch(self.batch_copy, inputs.shape[1])
+
+        # Normalises the input using min-max scaling, row by row
+        inputs_min = inputs.min(axis=1, keepdims=True)
+        inputs_max = inputs.max(axis=1, keepdims=True)
+        inputs = ((inputs - inputs_min) / (inputs_max - inputs_min))[:, np.newaxis, :]
 
+        if self.n_hidden[0] > 0:
+            bias1, weights1, bias2, weights2 = self.batch_weights
+            output1 = sigmoid_activation(np.matmul(inputs, weights1)[:, 0] + bias1)
+            output = sigmoid_activation(
+                np.matmul(output1[:, np.newaxis, :], weights2)[:, 0] + bias2
+            )
+        else:
+            bias, weights = self.batch_weights
+            output = sigmoid_activation(np.matmul(inputs, weights)[:, 0] + bias)
+
+        # takes decisions about sprite actions: left, right, jump, shoot, release
+        return (output > 0.5).astype(int)
+
+    # decodes one genome into its weights and biases (views of the genome array)
+    def decode(self, controller, n_inputs):
         if self.n_hidden[0] > 0:
             # Preparing the weights and biases from the controller of layer 1
 
             # Biases for the n hidden neurons
             bias1 = controller[: self.n_hidden[0]].reshape(1, self.n_hidden[0])
             # Weights for the connections from the inputs to the hidden nodes
-            weights1_slice = len(inputs) * self.n_hidden[0] + self.n_hidden[0]
+            weights1_slice = n_inputs * self.n_hidden[0] + self.n_hidden[0]
             weights1 = controller[self.n_hidden[0] : weights1_slice].reshape(
-                (len(inputs), self.n_hidden[0])
+                (n_inputs, self.n_hidden[0])
             )
 
-            # Outputs activation first layer.
-            output1 = sigmoid_activation(inputs.dot(weights1) + bias1)
-
             # Preparing the weights and biases from the controller of layer 2
             bias2 = controller[weights1_slice : weights1_slice + 5].reshape(1, 5)
             weights2 = controller[weights1_slice + 5 :].reshape((self.n_hidden[0], 5))
+            return bias1, weights1, bias2, weights2
+        else:
+            bias = controller[:5].reshape(1, 5)
+            weights = controller[5:].reshape((n_inputs, 5))
+            return bias, weights
+
+    def control(self, inputs, controller):
+        # decodes the genome only when it changes: a new genome, or the same array
+        # changed in place (DEAP crossover and mutation work in place). The weights are
+        # views of a private copy of the genes, so later changes never leak into them.
+        if controller is not self.genome or not np.array_equal(
+            controller, self.genome_copy
+        ):
+            self.genome = controller
+            self.genome_copy = np.array(controller, dtype=float)
+            self.weights = self.decode(self.genome_copy, len(inputs))
+
+        # Normalises the input using min-max scaling
+        inputs_min = inputs.min()
+        inputs = (inputs - inputs_min) / float(inputs.max() - inputs_min)
+
+        if self.n_hidden[0] > 0:
+            bias1, weights1, bias2, weights2 = self.weights
+
+            # Outputs activation first layer.
+            output1 = sigmoid_activation(inputs.dot(weights1) + bias1)
 
             # Outputting activated second layer. Each entry in the output is an action
             output = sigmoid_activation(output1.dot(weights2) + bias2)[0]
         else:
-            bias = controller[:5].reshape(1, 5)
-            weights = controller[5:].reshape((len(inputs), 5))
+            bias, weights = self.weights
 
             output = sigmoid_activation(inputs.dot(weights) + bias)[0]
 
@@ -8,6 +8,9 @@ sys.path.insert(0, "evoman")
 
 from environment import Environment
 from demo_controller import player_controller
+from parallel_evaluation import common_seeds
+from racing import RacingEvaluator
+from fitness_cache import FitnessCache, environment_settings
 
 import numpy as np
 import os
@@ -25,18 +28,27 @@ experiment_name = "ea1_deap_enemies278_new_run10"
 if not os.path.exists(experiment_name):
     os.makedirs(experiment_name)
 
+
 # initializes simulation in multi evolution mode, for multiple static enemies.
-env = Environment(
-    experiment_name=experiment_name,
-    enemies=[2, 7, 8],
-    multiplemode="yes",
-    playermode="ai",
-    player_controller=player_controller(n_hidden_neurons),
-    enemymode="static",
-    level=2,
-    speed="fastest",
-    randomini="yes",
-)
+# every worker process of the parallel evaluator builds its own environment with this;
+# only the main one writes the log file, so workers do not truncate it when they start
+def make_env(savelogs="no"):
+    return Environment(
+        experiment_name=experiment_name,
+        enemies=[2, 7, 8],
+        multiplemode="yes",
+        playermode="ai",
+        player_controller=player_controller(n_hidden_neurons),
+        enemymode="static",
+        level=2,
+        speed="fastest",
+        randomini="yes",
+        render="none",
+        savelogs=savelogs,
+    )
+
+
+env = make_env(savelogs="yes")
 
 # save the environment state in the directory
 env.state_to_log()
@@ -53,6 +65,20 @@ individual_mutation_probability = 0.1
 crossover_probability = 0.5
 alpha = 0.5
 
+# concerning the evaluation (1 process evaluates serially, with the same seeds)
+n_processes = os.cpu_count()
+base_seed = 0
+fitness_cache_file = None  # SQLite file keeping the evaluations across runs, or None
+# common random numbers: every individual of a generation plays the same n_seeds games
+# (new ones every generation) and its fitness is their 'statistic' (np.mean, np.median,
+# np.min...). with 0, every individual plays one game per enemy, each one seeded from its
+# genes and the enemy
+n_seeds = 0
+statistic = np.mean
+# racing: offspring stop playing enemies as soon as they can not be among the survivors
+# (not with n_seeds). the fitnesses, and so the survivors, are the same as without it
+racing = False
+
 # concerning the neural network
 lower, upper = -1.0, 1.0  # bounds on weights
 n_vars = (env.get_num_sensors() + 1) * n_hidden_neurons + (
@@ -96,7 +122,21 @@ toolbox.register(
 
 # create the population and an evaluation method
 toolbox.register("pop", tools.initRepeat, list, toolbox.create_individual)
-toolbox.register("evaluate", simulation, env=env)
+# the environment is supplied by the evaluator, which plays individuals in parallel
+toolbox.register("evaluate", simulation)
+# individuals are seeded from their genes, so the ones already played are taken from the cache
+cache = FitnessCache(
+    environment_settings(env, base_seed=base_seed), file_name=fitness_cache_file
+)
+evaluator = RacingEvaluator(
+    make_env,
+    env.enemies,
+    processes=n_processes,
+    base_seed=base_seed,
+    cache=cache,
+    statistic=statistic,
+)
+toolbox.register("map", evaluator.map)
 
 # after creating the population - initialize the functions for the type of evolution
 toolbox.register("mate", tools.cxBlend, alpha=alpha)
@@ -112,6 +152,18 @@ toolbox.register(
 toolbox.register("select", tools.selRoulette)
 toolbox.register("survivor", tools.selBest)
 
+
+# evaluates the individuals (see n_seeds and racing). with racing, 'known' are the
+# fitnesses of the other individuals the survivors are chosen among
+def evaluate(individuals, generation, known=()):
+    if n_seeds:
+        evaluator.seeds = common_seeds(n_seeds, generation, base_seed)
+        return toolbox.map(toolbox.evaluate, individuals)
+
+    keep = npop if racing else None
+    return [(f,) for f in evaluator.race(individuals, keep, known)]
+
+
 # for the statistics
 stats = tools.Statistics(lambda ind: ind.fitness.values)
 stats.register("max", np.max)
@@ -132,8 +184,9 @@ def main():
     # to save results
     logbook = tools.Logbook()
 
-    for i in pop:
-        fitness = toolbox.evaluate(i)  # (in numpy array form) evaluate every individual
+    # (in numpy array form) evaluate every individual
+    fitnesses = evaluate(pop, 0)
+    for i, fitness in zip(pop, fitnesses):
         i.fitness.values = fitness  # add the fitness value to the individual
 
     # save the best solution
@@ -190,9 +243,16 @@ def main():
         # see which ones don't have a fitness anymore:
         individual_no_fitness = [ind for ind in next_gen if not ind.fitness.valid]
 
-        # calculate fitness again if needed
-        for i in individual_no_fitness:
-            fitness = toolbox.evaluate(i)
+        # calculate fitness again if needed. with common random numbers all of them are
+        # played on the seeds of this generation, so the survivors are chosen among
+        # fitnesses on the same games (identical clones are played only once)
+        if n_seeds:
+            individual_no_fitness = next_gen
+            known = []
+        else:
+            known = [ind.fitness.values[0] for ind in next_gen if ind.fitness.valid]
+        fitnesses = evaluate(individual_no_fitness, generation + 1, known)
+        for i, fitness in zip(individual_no_fitness, fitnesses):
             i.fitness.values = fitness
 
         # decide which members are going to survive (mu, lambda)
@@ -260,6 +320,12 @@ def main():
     # saves best solution
     np.savetxt(experiment_name + "/best.txt", hall_of_fame.items[0])
 
+    evaluator.close()
+    cache.close()
+    print("fitness cache hits:", cache.hits, "misses:", cache.misses)
+    if racing:
+        print("racing games played:", evaluator.games, "skipped:", evaluator.skipped)
+
     print("Finished experiment!")
 
     return pop
@@ -0,0 +1,105 @@
+# checks the early stop policy of Environment ('stopfitness' and 'idletime') against
+# playing the same games in full, with the same seeds: a game stopped as idle must never
+# score better than its full replay, and one stopped for fitness must have a full replay
+# that does not reach 'stopfitness' either. the still player (all zero genome) is always
+# checked, as standing still is what the idle stop must not reward.
+import sys, os
+
+sys.path.insert(0, "evoman")
+from environment import Environment
+from demo_controller import player_controller
+import numpy as np
+
+
+# plays 'genome' against 'enemy' with 'seed', first with the early stop policy of 'env'
+# and then in full. returns (why it stopped, fitness when stopped, fitness in full)
+def replay(env, genome, enemy, seed):
+
+    env.set_random(seed)
+    stopped = env.run_single(enemy, genome, None)[0]
+    reason = env.stopped
+
+    policy = (env.stopfitness, env.idletime)
+    env.stopfitness, env.idletime = None, 0
+    try:
+        env.set_random(seed)
+        full = env.run_single(enemy, genome, None)[0]
+    finally:
+        env.stopfitness, env.idletime = policy
+
+    return reason, stopped, full
+
+
+# returns every wrong early stop as (genome, enemy, seed, reason, stopped, full),
+# and how many games were stopped for each reason
+def check(env, genomes, enemies, seeds):
+    wrong = []
+    stops = {"fitness": 0, "idle": 0}
+    for g, genome in enumerate(genomes):
+        for enemy in enemies:
+            for seed in seeds:
+                reason, stopped, full = replay(env, genome, enemy, seed)
+                if reason is None:
+                    continue
+                stops[reason] += 1
+                if (reason == "idle" and stopped > full) or (
+                    reason == "fitness" and full >= env.stopfitness
+                ):
+                    wrong.append((g, enemy, seed, reason, stopped, full))
+    return wrong, stops
+
+
+if __name__ == "__main__":
+
+    # CONFIGURATION
+    stopfitness = 85.0  # None to check only the idle stop
+    # short enough for the idle stop to happen: its state holds the enemy timers, which
+    # rarely stay still for long
+    idletime = 5  # 0 to check only the fitness stop
+    enemies = [1, 2, 3, 4, 5, 6, 7, 8]
+    seeds = [0, 1, 2]
+    n_random = 4  # random genomes checked besides the saved ones and the still player
+    genome_files = [
+        "ea1_deap_enemies278_new/ea1_deap_enemies278_new_run1/best.txt",
+        "ea1_deap_enemies78_new/ea1_deap_enemies78_new_run1/best.txt",
+    ]
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    experiment_name = "early_stop_check"
+    if not os.path.exists(experiment_name):
+        os.makedirs(experiment_name)
+
+    env = Environment(
+        experiment_name=experiment_name,
+        enemies=[enemies[0]],
+        playermode="ai",
+        player_controller=player_controller(10),
+        enemymode="static",
+        level=2,
+        speed="fastest",
+        randomini="yes",
+        logs="off",
+        savelogs="no",
+        render="none",
+        stopfitness=stopfitness,
+        idletime=idletime,
+    )
+
+    genomes = [np.loadtxt(f) for f in genome_files]
+    n_vars = len(genomes[0])
+    genomes.append(np.zeros(n_vars))
+    random = np.random.RandomState(0)
+    genomes += [random.uniform(-1, 1, n_vars) for i in range(n_random)]
+
+    wrong, stops = check(env, genomes, enemies, seeds)
+    for g, enemy, seed, reason, stopped, full in wrong:
+        print(
+            "genome %d, enemy %d, seed %d: stopped (%s) with %f, %f in full"
+            % (g, enemy, seed, reason, stopped, full)
+        )
+    if wrong:
+        sys.exit(1)
+    print(
+        "%d games stopped for fitness and %d as idle, all of them right"
+        % (stops["fitness"], stops["idle"])
+    )
@@ -0,0 +1,37 @@
+import pickle
+import pygame
+
+
+# images already decoded in this process, keyed by file name.
+# the surfaces are shared by every sprite using them, so they must not be drawn on.
+images = {}
+
+
+def load_image(fileName):
+    """Returns the image in fileName, decoding it only the first time it is asked for"""
+    image = images.get(fileName)
+    if image is None:
+        image = pygame.image.load(fileName)
+        images[fileName] = image
+    return image
+
+
+def save_images(fileName, fileNames):
+    """Decodes the given images and saves their raw pixels in a single file, so other
+    processes can fill their cache with load_images instead of decoding every image"""
+    blob = {}
+    for name in fileNames:
+        image = load_image(name)
+        blob[name] = (image.get_size(), pygame.image.tostring(image, "RGBA"))
+
+    with open(fileName, "wb") as f:
+        pickle.dump(blob, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_images(fileName):
+    """Fills the cache with the images saved by save_images"""
+    with open(fileName, "rb") as f:
+        blob = pickle.load(f)
+
+    for name, (size, pixels) in blob.items():
+        images[name] = pygame.image.fromstring(pixels, size, "RGBA")
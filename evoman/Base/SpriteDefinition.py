@@ -1,18 +1,54 @@
 import pygame
 from . import SpriteConstants
+from .ImageCache import load_image
+
+
+# frames already cut from each sprite sheet, shared by all the sprites using that sheet
+atlases = {}
+
+
+class FrameSize(object):
+    """Stands in for the frame images when there is no display to draw them on: only
+    their size is kept, which is what the sprites need for their collision rects"""
+
+    def __init__(self, width, height):
+        self.size = (width, height)
+
+    def get_size(self):
+        return self.size
 
 
 class SpriteDefinition(object):
     """Contains the properties and methods to control a SpriteSheet structure"""
 
     def __init__(self, fileName, origin_X, origin_Y, width, height):
-        self.SpriteSheet = pygame.image.load(fileName).convert()
         self.Origin_X = origin_X
         self.Origin_Y = origin_Y
         self.Width = width
         self.Height = height
 
-    def getImage(self, steps_X, steps_Y):
+        # without a display nothing is drawn, so no surface work is needed at all
+        self.Display = pygame.display.get_surface() is not None
+        if not self.Display:
+            self.Size = FrameSize(width, height)
+            return
+
+        # all the frames of the sheet are cut only once per process
+        key = (fileName, width, height)
+        if key not in atlases:
+            # converting to the screen pixel format needs a display (absent when headless)
+            self.SpriteSheet = load_image(fileName).convert()
+            self.Frames = {}
+            columns = self.SpriteSheet.get_width() // width
+            rows = self.SpriteSheet.get_height() // height
+            for steps_Y in range(rows):
+                for steps_X in range(columns):
+                    self.Frames[steps_X, steps_Y] = self.cutImage(steps_X, steps_Y)
+            atlases[key] = (self.SpriteSheet, self.Frames)
+
+        self.SpriteSheet, self.Frames = atlases[key]
+
+    def cutImage(self, steps_X, steps_Y):
         marginX = self.Width * steps_X
         marginY = self.Height * steps_Y
 
@@ -25,3 +61,13 @@ class SpriteDefinition(object):
         image.set_colorkey(SpriteConstants.BLACK)
 
         return image
+
+    def getImage(self, steps_X, steps_Y):
+        if not self.Display:
+            return self.Size
+
+        image = self.Frames.get((steps_X, steps_Y))
+        if image is None:
+            image = self.cutImage(steps_X, steps_Y)
+            self.Frames[steps_X, steps_Y] = image
+        return image
@@ -0,0 +1,24 @@
+class Twists(object):
+    """Keeps the live bullets (twists) of a sprite, in the order they were shot.
+
+    Every bullet is known by the number of bullets its sprite had shot before it
+    (its n_twist), and is removed as soon as it dies, so iterating goes only
+    through the live bullets and the memory used does not grow along the run"""
+
+    def __init__(self):
+        self.live = {}  # dicts keep the insertion order, i.e. the shooting order
+        self.shot = 0  # n_twist of the next bullet
+
+    def append(self, bullet):
+        self.live[self.shot] = bullet
+        self.shot += 1
+
+    def discard(self, n_twist):
+        self.live.pop(n_twist, None)
+
+    def __iter__(self):
+        # bullets can not be discarded while iterating: iterate over a list of them instead
+        return iter(self.live.values())
+
+    def __len__(self):
+        return len(self.live)
@@ -0,0 +1,148 @@
+# runs the games of a whole population against the same enemy in lock-step, in one process.
+# every game has its own (headless) Environment and all of them advance one frame at a time:
+# the sensors of the live games are stacked in one (population, sensors) array, so the player
+# controller can decide the actions of every individual at once with 'control_batch'.
+# controllers without 'control_batch' are called game by game with 'control'.
+# without seeds, games draw from the same numpy.random stream in turns, so with randomness
+# (randomini, random enemy attacks) the results are not the same as playing the games one
+# by one; with a seed per individual they are the same as Environment.play with that seed.
+
+import numpy
+
+from environment import Environment, random_state
+from controller import Controller
+from sensors import Sensors
+
+
+# player controller of a batched game: plays the actions decided for the whole batch
+class BatchActions(Controller):
+    def __init__(self):
+        self.actions = None
+
+    def control(self, params, cont=None):
+        return self.actions
+
+
+# player sensors of a batched game: read once per frame by the batch, then reused by the
+# player update instead of being computed again
+class BatchSensors(Sensors):
+    def read(self, game):
+        self.values = Sensors.get(self, game)
+        return self.values
+
+    def get(self, game):
+        return self.values
+
+
+class BatchEnvironment(object):
+
+    # size: number of games played together; other parameters are given to every Environment
+    def __init__(self, size, player_controller=None, **kwargs):
+
+        kwargs["render"] = "none"
+        kwargs["playermode"] = "ai"
+        # the batch reads the sensors and decides the actions outside of the games, so
+        # their frames can not be profiled: profile games one by one with Environment
+        kwargs["profile"] = "no"
+
+        self.player_controller = player_controller
+        self.envs = [
+            Environment(player_controller=BatchActions(), **kwargs) for i in range(size)
+        ]
+        self.enemies = self.envs[0].enemies
+        self.multiplemode = self.envs[0].multiplemode
+
+    # decides the actions of every game; only the live ones are asked to the controller
+    def control(self, sensors, population, live):
+
+        if hasattr(self.player_controller, "control_batch"):
+            return self.player_controller.control_batch(sensors, population)
+
+        actions = [None] * len(population)
+        for i in live:
+            actions[i] = self.player_controller.control(sensors[i], population[i])
+        return actions
+
+    # plays a batch of at most 'size' individuals against enemy 'enemyn'.
+    # randoms: the source of randomness of every individual (see random_state), or None
+    def run_batch(self, enemyn, population, econt, randoms=None):
+
+        envs = self.envs[: len(population)]
+        for i, (env, pcont) in enumerate(zip(envs, population)):
+            env.set_random(None if randoms is None else randoms[i])
+            env.reset(enemyn, pcont, econt)
+            env.player.sensors = BatchSensors()
+
+        # the genes do not change during the batch: controllers can decode them once
+        batched = hasattr(self.player_controller, "set_batch")
+        if batched:
+            self.player_controller.set_batch(population)
+
+        results = [None] * len(envs)
+        live = list(range(len(envs)))
+        sensors = None
+
+        while live:
+
+            for i in live:
+                envs[i].begin_frame()
+
+            # the player reads its sensors right at the beginning of its update
+            rows = [envs[i].player.sensors.read(envs[i]) for i in live]
+            if sensors is None:
+                sensors = numpy.zeros((len(envs), len(rows[0])))
+            sensors[live] = rows
+
+            actions = self.control(sensors, population, live)
+
+            still_live = []
+            for i in live:
+                envs[i].player_controller.actions = actions[i]
+                ended, results[i] = envs[i].end_frame()
+                if not ended:
+                    still_live.append(i)
+            live = still_live
+
+        if batched:
+            self.player_controller.set_batch(None)
+        return results
+
+    # plays every individual against enemy 'enemyn', in batches of 'size'
+    def run_single(self, enemyn, population, econt, randoms=None):
+
+        results = []
+        for first in range(0, len(population), len(self.envs)):
+            last = first + len(self.envs)
+            batch_randoms = None if randoms is None else randoms[first:last]
+            results += self.run_batch(
+                enemyn, population[first:last], econt, batch_randoms
+            )
+        return results
+
+    # repeats the runs for every enemy in list, consolidating them per individual
+    def multiple(self, population, econt, randoms=None):
+
+        runs = [self.run_single(e, population, econt, randoms) for e in self.enemies]
+
+        results = []
+        for i in range(len(population)):
+            values = numpy.array([run[i] for run in runs], dtype=float)
+            results.append(
+                tuple(self.envs[0].cons_multi(values[:, j]) for j in range(4))
+            )
+        return results
+
+    # plays every individual of the population: returns a (fitness, player life,
+    # enemy life, time) tuple per individual.
+    # seeds: one seed per individual (see random_state), or None for the global numpy.random
+    def play(self, population, econt="None", seeds=None):
+
+        # every individual keeps its own randomness through all the enemies
+        randoms = None
+        if seeds is not None:
+            randoms = [random_state(seed) for seed in seeds]
+
+        if self.multiplemode == "yes":
+            return self.multiple(population, econt, randoms)
+        else:
+            return self.run_single(self.enemies[0], population, econt, randoms)
@@ -8,13 +8,17 @@ import numpy
 
 
 class Controller(object):
+
+    # source of the random actions (the environment gives it its own when seeded)
+    random = numpy.random
+
     def control(self, params, cont=None):
 
-        action1 = numpy.random.choice([1, 0])
-        action2 = numpy.random.choice([1, 0])
-        action3 = numpy.random.choice([1, 0])
-        action4 = numpy.random.choice([1, 0])
-        action5 = numpy.random.choice([1, 0])
-        action6 = numpy.random.choice([1, 0])
+        action1 = self.random.choice([1, 0])
+        action2 = self.random.choice([1, 0])
+        action3 = self.random.choice([1, 0])
+        action4 = self.random.choice([1, 0])
+        action5 = self.random.choice([1, 0])
+        action6 = self.random.choice([1, 0])
 
         return [action1, action2, action3, action4, action5, action6]
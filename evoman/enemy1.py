@@ -11,7 +11,10 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import load_image
+from Base.Twists import Twists
 from sensors import Sensors
+from tmx import BLOCKER_L, BLOCKER_R, BLOCKER_T, BLOCKER_B
 
 tilemap = "evoman/map1.tmx"  # scenario
 timeexpire = 1000  # game run limit
@@ -38,7 +41,7 @@ class Enemy(pygame.sprite.Sprite):
         self.alternate = 1
         self.imune = 0
         self.timeenemy = 0
-        self.twists = []
+        self.twists = Twists()
         self.hurt = 0
         self.shooting = 1
         self.gun_cooldown = 0
@@ -49,7 +52,7 @@ class Enemy(pygame.sprite.Sprite):
         if game.time == 1:
             # puts enemy in random initial position
             if game.randomini == "yes":
-                self.rect.x = numpy.random.choice([640, 500, 400, 300])
+                self.rect.x = game.random.choice([640, 500, 400, 300])
 
         # increments enemy timer
         if game.start == 1:
@@ -162,12 +165,12 @@ class Enemy(pygame.sprite.Sprite):
             # controls screen walls and platforms limits towards enemy
             new = self.rect
             self.resting = 0
-            for cell in game.tilemap.layers["triggers"].collide(new, "blockers"):
+            for cell in game.tilemap.layers["triggers"].collide_blockers(new):
 
-                blockers = cell["blockers"]
+                blockers = cell.flags
 
                 if (
-                    "t" in blockers
+                    blockers & BLOCKER_T
                     and last.bottom <= cell.top
                     and new.bottom > cell.top
                 ):
@@ -176,14 +179,14 @@ class Enemy(pygame.sprite.Sprite):
                     self.dy = 0
 
                 if (
-                    "b" in blockers
+                    blockers & BLOCKER_B
                     and last.top >= cell.bottom
                     and new.top < cell.bottom
                 ):
                     new.top = cell.bottom
 
                 if (
-                    "l" in blockers
+                    blockers & BLOCKER_L
                     and last.right <= cell.left
                     and new.right > cell.left
                     and last.bottom > cell.top
@@ -194,7 +197,7 @@ class Enemy(pygame.sprite.Sprite):
                         self.dy = -600
 
                 if (
-                    "r" in blockers
+                    blockers & BLOCKER_R
                     and last.left >= cell.right
                     and new.left < cell.right
                     and last.bottom > cell.top
@@ -258,7 +261,7 @@ class Enemy(pygame.sprite.Sprite):
                         Bullet_e1(
                             (self.rect.x + (i * rand), self.rect.y + 10 + (i * rand2)),
                             1,
-                            len(self.twists),
+                            self.twists.shot,
                             game.sprite_e,
                         )
                     )
@@ -270,7 +273,7 @@ class Enemy(pygame.sprite.Sprite):
                                 self.rect.y + 10 + (i * rand2),
                             ),
                             -1,
-                            len(self.twists),
+                            self.twists.shot,
                             game.sprite_e,
                         )
                     )
@@ -305,7 +308,7 @@ class Enemy(pygame.sprite.Sprite):
 # Enemy's bullets.
 class Bullet_e1(pygame.sprite.Sprite):
 
-    image = pygame.image.load("evoman/images/bullet2_l.png")
+    image = load_image("evoman/images/bullet2_l.png")
 
     def __init__(self, location, direction, n_twist, *groups):
         super(Bullet_e1, self).__init__(*groups)
@@ -315,9 +318,9 @@ class Bullet_e1(pygame.sprite.Sprite):
 
         # Fits image according to the side the enemy is turned to.
         if self.direction == 1:
-            self.image = pygame.image.load("evoman/images/bullet2_r.png")
+            self.image = load_image("evoman/images/bullet2_r.png")
         else:
-            self.image = pygame.image.load("evoman/images/bullet2_l.png")
+            self.image = load_image("evoman/images/bullet2_l.png")
 
     def update(self, dt, game):
 
@@ -329,7 +332,7 @@ class Bullet_e1(pygame.sprite.Sprite):
             or self.rect.top > 512
         ):
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.discard(self.n_twist)
             return
 
         # Moving on the X axis.
@@ -343,7 +346,7 @@ class Bullet_e1(pygame.sprite.Sprite):
 
             # Removes the bullet off the screem after collision.
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.discard(self.n_twist)
 
             # Sets flag to change the player image when he is hurt.
             game.player.hurt = 5
@@ -11,7 +11,10 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import load_image
+from Base.Twists import Twists
 from sensors import Sensors
+from tmx import BLOCKER_L, BLOCKER_R, BLOCKER_T, BLOCKER_B
 
 tilemap = "evoman/map2.tmx"
 timeexpire = 1000  # game run limit
@@ -33,7 +36,7 @@ class Enemy(pygame.sprite.Sprite):
         self.life = self.max_life
         self.resting = 0
         self.dy = 0
-        self.twists = []
+        self.twists = Twists()
         self.alternate = 1
         self.imune = 0
         self.timeenemy = 0
@@ -46,7 +49,7 @@ class Enemy(pygame.sprite.Sprite):
         if game.time == 1:
             # puts enemy in random initial position
             if game.randomini == "yes":
-                self.rect.x = numpy.random.choice([630, 610, 560, 530])
+                self.rect.x = game.random.choice([630, 610, 560, 530])
 
         # defines game mode for player action.
         if game.enemymode == "static":  # enemy controlled by static movements
@@ -178,26 +181,26 @@ class Enemy(pygame.sprite.Sprite):
             # controls screen walls and platforms limits agaist enemy.
             new = self.rect
             self.resting = 0
-            for cell in game.tilemap.layers["triggers"].collide(new, "blockers"):
+            for cell in game.tilemap.layers["triggers"].collide_blockers(new):
 
-                blockers = cell["blockers"]
+                blockers = cell.flags
 
                 if (
-                    "l" in blockers
+                    blockers & BLOCKER_L
                     and last.right <= cell.left
                     and new.right > cell.left
                 ):
                     new.right = cell.left
 
                 if (
-                    "r" in blockers
+                    blockers & BLOCKER_R
                     and last.left >= cell.right
                     and new.left < cell.right
                 ):
                     new.left = cell.right
 
                 if (
-                    "t" in blockers
+                    blockers & BLOCKER_T
                     and last.bottom <= cell.top
                     and new.bottom > cell.top
                 ):
@@ -206,7 +209,7 @@ class Enemy(pygame.sprite.Sprite):
                     self.dy = 0
 
                 if (
-                    "b" in blockers
+                    blockers & BLOCKER_B
                     and last.top >= cell.bottom
                     and new.top < cell.bottom
                 ):
@@ -233,7 +236,7 @@ class Enemy(pygame.sprite.Sprite):
                             (self.rect.x + 10, self.rect.bottom),
                             self.direction,
                             i,
-                            len(self.twists),
+                            self.twists.shot,
                             game.sprite_e,
                         )
                     )
@@ -267,7 +270,7 @@ class Enemy(pygame.sprite.Sprite):
 # enemy's bullet
 class Bullet_e2(pygame.sprite.Sprite):
 
-    image = pygame.image.load("evoman/images/torna.png")
+    image = load_image("evoman/images/torna.png")
 
     def __init__(self, location, direction, n, n_twist, *groups):
         super(Bullet_e2, self).__init__(*groups)
@@ -280,9 +283,9 @@ class Bullet_e2(pygame.sprite.Sprite):
     def update(self, dt, game):
 
         if game.time % 2 == 0:
-            self.image = pygame.image.load("evoman/images/torna.png")
+            self.image = load_image("evoman/images/torna.png")
         else:
-            self.image = pygame.image.load("evoman/images/torna2.png")
+            self.image = load_image("evoman/images/torna2.png")
 
         # removes bullets objetcs when they transpass the screen limits
         if (
@@ -292,7 +295,7 @@ class Bullet_e2(pygame.sprite.Sprite):
             or self.rect.top > 512
         ):
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.discard(self.n_twist)
             return
 
         # enemy atack: blows the player forward with the bullets
@@ -333,10 +336,7 @@ class Bullet_e2(pygame.sprite.Sprite):
             game.player.hurt = 5
 
         # removes player's bullets when colliding with enemy's bullets
-        aux = 0
-        for t in game.player.twists:
-            if t != None:
-                if self.rect.colliderect(t.rect):
-                    t.kill()
-                    game.player.twists[aux] = None
-            aux += 1
+        for t in list(game.player.twists):
+            if self.rect.colliderect(t.rect):
+                t.kill()
+                game.player.twists.discard(t.n_twist)
@@ -11,7 +11,10 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import load_image
+from Base.Twists import Twists
 from sensors import Sensors
+from tmx import BLOCKER_L, BLOCKER_R, BLOCKER_T, BLOCKER_B
 
 tilemap = "evoman/map2.tmx"
 timeexpire = 1000  # game run limit
@@ -31,7 +34,7 @@ class Enemy(pygame.sprite.Sprite):
         self.life = self.max_life
         self.resting = 0
         self.dy = 0
-        self.twists = []
+        self.twists = Twists()
         self.alternate = 1
         self.imune = 0
         self.timeenemy = 0
@@ -44,7 +47,7 @@ class Enemy(pygame.sprite.Sprite):
         if game.time == 1:
             # puts enemy in random initial position
             if game.randomini == "yes":
-                self.rect.x = numpy.random.choice([640, 500, 400, 300])
+                self.rect.x = game.random.choice([640, 500, 400, 300])
 
         # defines game mode for player action
         if game.enemymode == "static":  # enemy controlled by static movements
@@ -179,26 +182,26 @@ class Enemy(pygame.sprite.Sprite):
             # controls screen walls and platforms limits agaist enemy
             new = self.rect
             self.resting = 0
-            for cell in game.tilemap.layers["triggers"].collide(new, "blockers"):
+            for cell in game.tilemap.layers["triggers"].collide_blockers(new):
 
-                blockers = cell["blockers"]
+                blockers = cell.flags
 
                 if (
-                    "l" in blockers
+                    blockers & BLOCKER_L
                     and last.right <= cell.left
                     and new.right > cell.left
                 ):
                     new.right = cell.left
 
                 if (
-                    "r" in blockers
+                    blockers & BLOCKER_R
                     and last.left >= cell.right
                     and new.left < cell.right
                 ):
                     new.left = cell.right
 
                 if (
-                    "t" in blockers
+                    blockers & BLOCKER_T
                     and last.bottom <= cell.top
                     and new.bottom > cell.top
                 ):
@@ -207,7 +210,7 @@ class Enemy(pygame.sprite.Sprite):
                     self.dy = 0
 
                 if (
-                    "b" in blockers
+                    blockers & BLOCKER_B
                     and last.top >= cell.bottom
                     and new.top < cell.bottom
                 ):
@@ -238,7 +241,7 @@ class Enemy(pygame.sprite.Sprite):
                                 (self.rect.x + ax[i], self.rect.y - ay[i]),
                                 1,
                                 "h",
-                                len(self.twists),
+                                self.twists.shot,
                                 game.sprite_e,
                             )
                         )
@@ -249,7 +252,7 @@ class Enemy(pygame.sprite.Sprite):
                                 (self.rect.x - ax[i], self.rect.y - ay[i]),
                                 -1,
                                 "h",
-                                len(self.twists),
+                                self.twists.shot,
                                 game.sprite_e,
                             )
                         )
@@ -258,7 +261,7 @@ class Enemy(pygame.sprite.Sprite):
                 aux = 100
                 for i in range(0, 4):
                     self.twists.append(
-                        Bullet_e3((aux, 100), 1, "v", len(self.twists), game.sprite_e)
+                        Bullet_e3((aux, 100), 1, "v", self.twists.shot, game.sprite_e)
                     )
                     aux = aux + 150
 
@@ -291,7 +294,7 @@ class Enemy(pygame.sprite.Sprite):
 # enemy's bullet
 class Bullet_e3(pygame.sprite.Sprite):
 
-    image = pygame.image.load("evoman/images/met.png")
+    image = load_image("evoman/images/met.png")
 
     def __init__(self, location, direction, btype, n_twist, *groups):
         super(Bullet_e3, self).__init__(*groups)
@@ -305,9 +308,9 @@ class Bullet_e3(pygame.sprite.Sprite):
     def update(self, dt, game):
 
         if game.time % 2 == 0:
-            self.image = pygame.image.load("evoman/images/met.png")
+            self.image = load_image("evoman/images/met.png")
         else:
-            self.image = pygame.image.load("evoman/images/met2.png")
+            self.image = load_image("evoman/images/met2.png")
 
         # decreases bullet's timer
         self.lifespan -= 1
@@ -320,7 +323,7 @@ class Bullet_e3(pygame.sprite.Sprite):
             or self.rect.top > 512
         ):
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.discard(self.n_twist)
             return
 
         # moves the bullets
@@ -358,10 +361,7 @@ class Bullet_e3(pygame.sprite.Sprite):
             game.player.hurt = 5
 
         # removes player's bullets when colliding with enemy's bullets
-        aux = 0
-        for t in game.player.twists:
-            if t != None:
-                if self.rect.colliderect(t.rect):
-                    t.kill()
-                    game.player.twists[aux] = None
-            aux += 1
+        for t in list(game.player.twists):
+            if self.rect.colliderect(t.rect):
+                t.kill()
+                game.player.twists.discard(t.n_twist)
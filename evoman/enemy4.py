@@ -11,7 +11,10 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import load_image
+from Base.Twists import Twists
 from sensors import Sensors
+from tmx import BLOCKER_L, BLOCKER_R, BLOCKER_T, BLOCKER_B
 
 tilemap = "evoman/map2.tmx"
 timeexpire = 1500  # game run limit
@@ -31,7 +34,7 @@ class Enemy(pygame.sprite.Sprite):
         self.life = self.max_life
         self.resting = 0
         self.dy = 0
-        self.twists = []
+        self.twists = Twists()
         self.alternate = 1
         self.fireflash = 0
         self.imune = 0
@@ -47,7 +50,7 @@ class Enemy(pygame.sprite.Sprite):
         if game.time == 1:
             # puts enemy in random initial position
             if game.randomini == "yes":
-                self.rect.x = numpy.random.choice([640, 500, 400, 300])
+                self.rect.x = game.random.choice([640, 500, 400, 300])
 
         # defines game mode for player action
         if game.enemymode == "static":  # enemy controlled by static movements
@@ -169,26 +172,26 @@ class Enemy(pygame.sprite.Sprite):
             # controls screen walls and platforms limits agaist enemy
             new = self.rect
             self.resting = 0
-            for cell in game.tilemap.layers["triggers"].collide(new, "blockers"):
+            for cell in game.tilemap.layers["triggers"].collide_blockers(new):
 
-                blockers = cell["blockers"]
+                blockers = cell.flags
 
                 if (
-                    "l" in blockers
+                    blockers & BLOCKER_L
                     and last.right <= cell.left
                     and new.right > cell.left
                 ):
                     new.right = cell.left
 
                 if (
-                    "r" in blockers
+                    blockers & BLOCKER_R
                     and last.left >= cell.right
                     and new.left < cell.right
                 ):
                     new.left = cell.right
 
                 if (
-                    "t" in blockers
+                    blockers & BLOCKER_T
                     and last.bottom <= cell.top
                     and new.bottom > cell.top
                 ):
@@ -197,7 +200,7 @@ class Enemy(pygame.sprite.Sprite):
                     self.dy = 0
 
                 if (
-                    "b" in blockers
+                    blockers & BLOCKER_B
                     and last.top >= cell.bottom
                     and new.top < cell.bottom
                 ):
@@ -226,7 +229,7 @@ class Enemy(pygame.sprite.Sprite):
                                 (self.rect.x, self.rect.y),
                                 self.direction,
                                 i,
-                                len(self.twists),
+                                self.twists.shot,
                                 game.sprite_e,
                             )
                         )
@@ -250,9 +253,9 @@ class Enemy(pygame.sprite.Sprite):
             #  changes the image when enemy is hurt and imune, as a fireball
             if self.imune == 1:
                 if game.time % 2 == 0:
-                    self.image = pygame.image.load("evoman/images/fireball.png")
+                    self.image = load_image("evoman/images/fireball.png")
                 else:
-                    self.image = pygame.image.load("evoman/images/fireball2.png")
+                    self.image = load_image("evoman/images/fireball2.png")
 
             self.hurt -= 1
 
@@ -263,7 +266,7 @@ class Enemy(pygame.sprite.Sprite):
 # enemy bullets
 class Bullet_e4(pygame.sprite.Sprite):
 
-    image = pygame.image.load("evoman/images/bullet_l.png")
+    image = load_image("evoman/images/bullet_l.png")
 
     def __init__(self, location, direction, n, n_twist, *groups):
         super(Bullet_e4, self).__init__(*groups)
@@ -315,7 +318,7 @@ class Bullet_e4(pygame.sprite.Sprite):
 
         if self.lifespan < 0:
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.discard(self.n_twist)
             return
 
         if (
@@ -325,7 +328,7 @@ class Bullet_e4(pygame.sprite.Sprite):
             or self.rect.bottom > 512
         ):
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.discard(self.n_twist)
             return
 
         # checks collision of enemy's bullet with the player
@@ -11,7 +11,10 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import load_image
+from Base.Twists import Twists
 from sensors import Sensors
+from tmx import BLOCKER_L, BLOCKER_R, BLOCKER_T, BLOCKER_B
 
 tilemap = "evoman/map2.tmx"
 timeexpire = 1000  # game run limit
@@ -38,7 +41,7 @@ class Enemy(pygame.sprite.Sprite):
         self.countmove = 0
         self.rect.x = 500
         self.timeenemy = 0
-        self.twists = []
+        self.twists = Twists()
         self.hurt = 0
         self.shooting = 0
         self.gun_cooldown = 0
@@ -48,7 +51,7 @@ class Enemy(pygame.sprite.Sprite):
         if game.time == 1:
             # puts enemy in random initial position
             if game.randomini == "yes":
-                self.rect.x = numpy.random.choice([640, 500, 400, 300])
+                self.rect.x = game.random.choice([640, 500, 400, 300])
 
         # Defines game mode for player action.
         if game.enemymode == "static":  # Enemy controlled by static movements.
@@ -99,12 +102,12 @@ class Enemy(pygame.sprite.Sprite):
             self.timeenemy += 1  # increments enemy timer
 
             # moving floor, changes the movement direction from time to time.
-            for cell in game.tilemap.layers["triggers"].collide(
-                game.player.rect, "blockers"
+            for cell in game.tilemap.layers["triggers"].collide_blockers(
+                game.player.rect
             ):
 
-                blockers = cell["blockers"]
-                if "t" in blockers:
+                blockers = cell.flags
+                if blockers & BLOCKER_T:
 
                     game.player.rect.x += (
                         self.direction_floor * 100 * dt
@@ -160,7 +163,7 @@ class Enemy(pygame.sprite.Sprite):
                     c.set_volume(10)
                     c.play(sound)
 
-                aux = numpy.random.randint(1, 4)
+                aux = game.random.randint(1, 4)
                 for i in range(0, aux):
                     self.twists.append(
                         Bullet_e5(
@@ -170,7 +173,7 @@ class Enemy(pygame.sprite.Sprite):
                             ),
                             self.direction,
                             game.player.rect,
-                            len(self.twists),
+                            self.twists.shot,
                             game.sprite_e,
                         )
                     )
@@ -190,7 +193,7 @@ class Enemy(pygame.sprite.Sprite):
                         (self.rect.x, self.rect.top),
                         self.direction,
                         game.player.rect,
-                        len(self.twists),
+                        self.twists.shot,
                         game.sprite_e,
                     )
                 )
@@ -248,26 +251,26 @@ class Enemy(pygame.sprite.Sprite):
             # controls screen walls and platforms limits agaist enemy
             new = self.rect
             self.resting = 0
-            for cell in game.tilemap.layers["triggers"].collide(new, "blockers"):
+            for cell in game.tilemap.layers["triggers"].collide_blockers(new):
 
-                blockers = cell["blockers"]
+                blockers = cell.flags
 
                 if (
-                    "l" in blockers
+                    blockers & BLOCKER_L
                     and last.right <= cell.left
                     and new.right > cell.left
                 ):
                     new.right = cell.left
 
                 if (
-                    "r" in blockers
+                    blockers & BLOCKER_R
                     and last.left >= cell.right
                     and new.left < cell.right
                 ):
                     new.left = cell.right
 
                 if (
-                    "t" in blockers
+                    blockers & BLOCKER_T
                     and last.bottom <= cell.top
                     and new.bottom > cell.top
                 ):
@@ -276,7 +279,7 @@ class Enemy(pygame.sprite.Sprite):
                     self.dy = 0
 
                 if (
-                    "b" in blockers
+                    blockers & BLOCKER_B
                     and last.top >= cell.bottom
                     and new.top < cell.bottom
                 ):
@@ -308,7 +311,7 @@ class Enemy(pygame.sprite.Sprite):
 # enemy bullets
 class Bullet_e5(pygame.sprite.Sprite):
 
-    image = pygame.image.load("evoman/images/blade.png")
+    image = load_image("evoman/images/blade.png")
 
     def __init__(self, location, direction, pos_p, n_twist, *groups):
         super(Bullet_e5, self).__init__(*groups)
@@ -332,7 +335,7 @@ class Bullet_e5(pygame.sprite.Sprite):
             or self.rect.top > 512
         ):
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.discard(self.n_twist)
             return
 
         # checks collision of enemy's bullet with the player
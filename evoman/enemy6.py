@@ -11,7 +11,10 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import load_image
+from Base.Twists import Twists
 from sensors import Sensors
+from tmx import BLOCKER_L, BLOCKER_R, BLOCKER_T, BLOCKER_B
 
 tilemap = "evoman/map2.tmx"
 timeexpire = 2200  # game run limit
@@ -31,7 +34,7 @@ class Enemy(pygame.sprite.Sprite):
         self.life = self.max_life
         self.resting = 0
         self.dy = 0
-        self.twists = []
+        self.twists = Twists()
         self.alternate = 1
         self.just_shoot = 0
         self.imune = 0
@@ -45,7 +48,7 @@ class Enemy(pygame.sprite.Sprite):
         if game.time == 1:
             # puts enemy in random initial position
             if game.randomini == "yes":
-                self.rect.x = numpy.random.choice([640, 500, 400, 300])
+                self.rect.x = game.random.choice([640, 500, 400, 300])
 
         # Defines game mode for player action.
         if game.enemymode == "static":  # Enemy controlled by static movements.
@@ -149,7 +152,7 @@ class Enemy(pygame.sprite.Sprite):
                     Bullet_e6(
                         (self.rect.x, self.rect.y),
                         self.direction,
-                        len(self.twists),
+                        self.twists.shot,
                         game.sprite_e,
                     )
                 )
@@ -212,26 +215,26 @@ class Enemy(pygame.sprite.Sprite):
             # controls screen walls and platforms limits agaist enemy
             new = self.rect
             self.resting = 0
-            for cell in game.tilemap.layers["triggers"].collide(new, "blockers"):
+            for cell in game.tilemap.layers["triggers"].collide_blockers(new):
 
-                blockers = cell["blockers"]
+                blockers = cell.flags
 
                 if (
-                    "l" in blockers
+                    blockers & BLOCKER_L
                     and last.right <= cell.left
                     and new.right > cell.left
                 ):
                     new.right = cell.left
 
                 if (
-                    "r" in blockers
+                    blockers & BLOCKER_R
                     and last.left >= cell.right
                     and new.left < cell.right
                 ):
                     new.left = cell.right
 
                 if (
-                    "t" in blockers
+                    blockers & BLOCKER_T
                     and last.bottom <= cell.top
                     and new.bottom > cell.top
                 ):
@@ -241,7 +244,7 @@ class Enemy(pygame.sprite.Sprite):
                     self.just_shoot = 0
 
                 if (
-                    "b" in blockers
+                    blockers & BLOCKER_B
                     and last.top >= cell.bottom
                     and new.top < cell.bottom
                 ):
@@ -273,7 +276,7 @@ class Enemy(pygame.sprite.Sprite):
 # enemy's bullet
 class Bullet_e6(pygame.sprite.Sprite):
 
-    image = pygame.image.load("evoman/images/mi2.png")
+    image = load_image("evoman/images/mi2.png")
 
     def __init__(self, location, direction, n_twist, *groups):
         super(Bullet_e6, self).__init__(*groups)
@@ -295,7 +298,7 @@ class Bullet_e6(pygame.sprite.Sprite):
         # removes old bullets
         if self.lifespan < 0:
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.discard(self.n_twist)
             return
 
         # checks collision of enemy's bullet with the player
@@ -11,7 +11,10 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import load_image
+from Base.Twists import Twists
 from sensors import Sensors
+from tmx import BLOCKER_L, BLOCKER_R, BLOCKER_T, BLOCKER_B
 
 tilemap = "evoman/map4.tmx"
 timeexpire = 1000  # game run limit
@@ -34,7 +37,7 @@ class Enemy(pygame.sprite.Sprite):
         self.alternate = 1
         self.imune = 0
         self.timeenemy = 0
-        self.twists = []
+        self.twists = Twists()
         self.bullets = 0
         self.hurt = 0
         self.shooting = 0
@@ -46,7 +49,7 @@ class Enemy(pygame.sprite.Sprite):
         if game.time == 1:
             # puts enemy in random initial position
             if game.randomini == "yes":
-                self.rect.x = numpy.random.choice([640, 500, 400, 300])
+                self.rect.x = game.random.choice([640, 500, 400, 300])
 
         # defines game mode for player actionv
         if game.enemymode == "static":  # enemy controlled by static movements
@@ -139,12 +142,12 @@ class Enemy(pygame.sprite.Sprite):
                     c.set_volume(10)
                     c.play(sound)
 
-                rand = numpy.random.randint(0, 25, 1)
+                rand = game.random.randint(0, 25, 1)
                 self.twists.append(
                     Bullet_e7(
                         (self.rect.x, self.rect.y),
                         self.direction,
-                        len(self.twists),
+                        self.twists.shot,
                         game.sprite_e,
                     )
                 )
@@ -169,7 +172,7 @@ class Enemy(pygame.sprite.Sprite):
                                     self.rect.y - i * 30,
                                 ),
                                 self.direction,
-                                len(self.twists),
+                                self.twists.shot,
                                 game.sprite_e,
                             )
                         )
@@ -249,26 +252,26 @@ class Enemy(pygame.sprite.Sprite):
             # controls screen walls and platforms limits agaist enemy
             new = self.rect
             self.resting = 0
-            for cell in game.tilemap.layers["triggers"].collide(new, "blockers"):
+            for cell in game.tilemap.layers["triggers"].collide_blockers(new):
 
-                blockers = cell["blockers"]
+                blockers = cell.flags
 
                 if (
-                    "l" in blockers
+                    blockers & BLOCKER_L
                     and last.right <= cell.left
                     and new.right > cell.left
                 ):
                     new.right = cell.left
 
                 if (
-                    "r" in blockers
+                    blockers & BLOCKER_R
                     and last.left >= cell.right
                     and new.left < cell.right
                 ):
                     new.left = cell.right
 
                 if (
-                    "t" in blockers
+                    blockers & BLOCKER_T
                     and last.bottom <= cell.top
                     and new.bottom > cell.top
                 ):
@@ -277,7 +280,7 @@ class Enemy(pygame.sprite.Sprite):
                     self.dy = 0
 
                 if (
-                    "b" in blockers
+                    blockers & BLOCKER_B
                     and last.top >= cell.bottom
                     and new.top < cell.bottom
                 ):
@@ -309,7 +312,7 @@ class Enemy(pygame.sprite.Sprite):
 # enemy's bullet
 class Bullet_e7(pygame.sprite.Sprite):
 
-    image = pygame.image.load("evoman/images/bullet2_l.png")
+    image = load_image("evoman/images/bullet2_l.png")
 
     def __init__(self, location, direction, n_twist, *groups):
         super(Bullet_e7, self).__init__(*groups)
@@ -329,7 +332,7 @@ class Bullet_e7(pygame.sprite.Sprite):
             or self.rect.top > 512
         ):
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.discard(self.n_twist)
             return
 
         # checks collision of enemy's bullet with the player
@@ -357,7 +360,7 @@ class Bullet_e7(pygame.sprite.Sprite):
 # enemy's bullet 2 (bubble)
 class Bullet_e72(pygame.sprite.Sprite):
 
-    image = pygame.image.load("evoman/images/bubb.png")
+    image = load_image("evoman/images/bubb.png")
 
     def __init__(self, location, direction, n_twist, *groups):
         super(Bullet_e72, self).__init__(*groups)
@@ -385,7 +388,7 @@ class Bullet_e72(pygame.sprite.Sprite):
             or self.rect.top > 512
         ):
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.discard(self.n_twist)
             game.enemy.bullets -= 1
             return
 
@@ -11,7 +11,10 @@ import random
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import load_image
+from Base.Twists import Twists
 from sensors import Sensors
+from tmx import BLOCKER_L, BLOCKER_R, BLOCKER_T, BLOCKER_B
 
 tilemap = "evoman/map3.tmx"
 timeexpire = 1000  # game run limit
@@ -35,7 +38,7 @@ class Enemy(pygame.sprite.Sprite):
         self.just_shoot = 0
         self.imune = 0
         self.timeenemy = 0
-        self.twists = []
+        self.twists = Twists()
         self.hurt = 0
         self.shooting = 0
         self.gun_cooldown = 0
@@ -46,7 +49,7 @@ class Enemy(pygame.sprite.Sprite):
 
             # puts enemy in random initial position
             if game.randomini == "yes":
-                self.rect.x = numpy.random.choice([640, 500, 400, 300])
+                self.rect.x = game.random.choice([640, 500, 400, 300])
 
         # defines game mode for player action
         if game.enemymode == "static":  # enemy controlled by static movements
@@ -168,7 +171,7 @@ class Enemy(pygame.sprite.Sprite):
                             (self.rect.x + (i * 60), self.rect.y),
                             i,
                             self.direction,
-                            len(self.twists),
+                            self.twists.shot,
                             game.sprite_e,
                         )
                     )
@@ -219,12 +222,12 @@ class Enemy(pygame.sprite.Sprite):
             # controls screen walls and platforms limits agaist enemy
             new = self.rect
             self.resting = 0
-            for cell in game.tilemap.layers["triggers"].collide(new, "blockers"):
+            for cell in game.tilemap.layers["triggers"].collide_blockers(new):
 
-                blockers = cell["blockers"]
+                blockers = cell.flags
 
                 if (
-                    "t" in blockers
+                    blockers & BLOCKER_T
                     and last.bottom <= cell.top
                     and new.bottom > cell.top
                 ):
@@ -234,14 +237,14 @@ class Enemy(pygame.sprite.Sprite):
                     self.just_shoot = 0
 
                 if (
-                    "b" in blockers
+                    blockers & BLOCKER_B
                     and last.top >= cell.bottom
                     and new.top < cell.bottom
                 ):
                     new.top = cell.bottom
 
                 if (
-                    "l" in blockers
+                    blockers & BLOCKER_L
                     and last.right <= cell.left
                     and new.right > cell.left
                     and last.bottom > cell.top
@@ -249,7 +252,7 @@ class Enemy(pygame.sprite.Sprite):
                     new.right = cell.left
 
                 if (
-                    "r" in blockers
+                    blockers & BLOCKER_R
                     and last.left >= cell.right
                     and new.left < cell.right
                     and last.bottom > cell.top
@@ -282,7 +285,7 @@ class Enemy(pygame.sprite.Sprite):
 # enemy's bullet
 class Bullet_e8(pygame.sprite.Sprite):
 
-    image = pygame.image.load("evoman/images/bullet2_l.png")
+    image = load_image("evoman/images/bullet2_l.png")
 
     def __init__(self, location, direction, n, n_twist, *groups):
         super(Bullet_e8, self).__init__(*groups)
@@ -321,7 +324,7 @@ class Bullet_e8(pygame.sprite.Sprite):
             or self.rect.top > 512
         ):
             self.kill()
-            game.enemy.twists[self.n_twist] = None
+            game.enemy.twists.discard(self.n_twist)
             return
 
         # checks collision of enemy's bullet with the player
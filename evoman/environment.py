@@ -11,10 +11,25 @@ import numpy
 import pygame
 from pygame.locals import *
 import struct
+import json
 import tmx
 
 from player import *
 from controller import Controller
+from frame_profiler import FrameProfiler, TimedController
+
+
+# returns the source of randomness for 'seed': a seed for a new numpy RandomState, a
+# RandomState, or a numpy Generator (whose bit generator it draws from).
+# None is the global numpy.random state.
+def random_state(seed=None):
+    if seed is None:
+        return numpy.random
+    if isinstance(seed, numpy.random.RandomState):
+        return seed
+    if isinstance(seed, numpy.random.Generator):
+        return numpy.random.RandomState(seed.bit_generator)
+    return numpy.random.RandomState(seed)
 
 
 # main class
@@ -46,6 +61,10 @@ class Environment(object):
         player_controller=None,  # controller object
         enemy_controller=None,  # controller object
         use_joystick=False,
+        render="display",  # display or none
+        profile="no",  # yes or no
+        stopfitness=None,  # number or None
+        idletime=0,  # integer, 0 for never
     ):
 
         # initializes parameters
@@ -73,6 +92,25 @@ class Environment(object):
         self.solutions = solutions
         self.joy = 0
         self.use_joystick = use_joystick
+        self.render = render
+        self.screen_size = (736, 512)
+        self.profile = profile
+        self.stopfitness = stopfitness
+        self.idletime = idletime
+        # why the last play was stopped early (see check_stop): None or a reason for a
+        # single game, a list with the one of every enemy in multiple mode. play only
+        # returns the results, so evaluation functions run by worker processes must
+        # return env.stopped along with them for it to reach the main process
+        self.stopped = None
+
+        # randomness of the games (initial positions, enemy attacks, random controllers)
+        self.random = numpy.random
+
+        # accumulates the time spent in every phase of the frames
+        if self.profile == "yes":
+            self.profiler = FrameProfiler()
+        else:
+            self.profiler = None
 
         # initializes default random controllers
 
@@ -91,12 +129,15 @@ class Environment(object):
             file_aux = open(self.experiment_name + "/evoman_logs.txt", "w")
             file_aux.close()
 
-        # initializes pygame library
-        pygame.init()
-        self.print_logs("MESSAGE: Pygame initialized for simulation.")
+        # initializes pygame library (headless runs never open a display)
+        if self.render == "display":
+            pygame.init()
+            self.print_logs("MESSAGE: Pygame initialized for simulation.")
+        else:
+            self.print_logs("MESSAGE: rendering is off, running headless.")
 
-        # initializes sound library for playing mode
-        if self.sound == "on":
+        # initializes sound library for playing mode (headless runs never use audio)
+        if self.sound == "on" and self.render == "display":
             pygame.mixer.init()
             self.print_logs("MESSAGE: sound has been turned on.")
 
@@ -107,15 +148,20 @@ class Environment(object):
 
         self.clock = pygame.time.Clock()  # initializes game clock resource
 
-        if self.fullscreen:
-            flags = DOUBLEBUF | FULLSCREEN
-        else:
-            flags = DOUBLEBUF
+        if self.render == "display":
+            if self.fullscreen:
+                flags = DOUBLEBUF | FULLSCREEN
+            else:
+                flags = DOUBLEBUF
 
-        self.screen = pygame.display.set_mode((736, 512), flags)
+            self.screen = pygame.display.set_mode(self.screen_size, flags)
 
-        self.screen.set_alpha(None)  # disables uneeded alpha
-        pygame.event.set_allowed([QUIT, KEYDOWN, KEYUP])  # enables only needed events
+            self.screen.set_alpha(None)  # disables uneeded alpha
+            pygame.event.set_allowed(
+                [QUIT, KEYDOWN, KEYUP]
+            )  # enables only needed events
+        else:
+            self.screen = None
 
         self.load_sprites()
 
@@ -123,7 +169,7 @@ class Environment(object):
 
         # loads enemy and map
         enemy = __import__("enemy" + str(self.enemyn))
-        self.tilemap = tmx.load(enemy.tilemap, self.screen.get_size())  # map
+        self.tilemap = tmx.load_cached(enemy.tilemap, self.screen_size)  # map
 
         self.sprite_e = tmx.SpriteLayer()
         start_cell = self.tilemap.layers["triggers"].find("enemy")[0]
@@ -214,6 +260,10 @@ class Environment(object):
         self.print_logs("overture time: " + str(self.overturetime))
         self.print_logs("logs: " + self.logs)
         self.print_logs("save logs: " + self.savelogs)
+        self.print_logs("render: " + self.render)
+        self.print_logs("profile: " + self.profile)
+        self.print_logs("stop fitness: " + str(self.stopfitness))
+        self.print_logs("idle time: " + str(self.idletime))
         self.print_logs("########## Simulation state - END ###########")
 
     # exports current environment state to files
@@ -242,6 +292,8 @@ class Environment(object):
         file_aux.write("\nsound " + self.sound)
         file_aux.write("\nlogs " + self.logs)
         file_aux.write("\nsavelogs " + self.savelogs)
+        file_aux.write("\nrender " + self.render)
+        file_aux.write("\nprofile " + self.profile)
         file_aux.close()
 
         # saves state of solutions in the simulation
@@ -345,6 +397,32 @@ class Environment(object):
             self.print_logs("ERROR: 'contacthurt' value must be 'player' or 'enemy'.")
             sys.exit(0)
 
+        if self.render not in ("display", "none"):
+            self.print_logs("ERROR: 'render' value must be 'display' or 'none'.")
+            sys.exit(0)
+
+        if self.render == "none" and self.playermode == "human":
+            self.print_logs("ERROR: 'render' must be 'display' for human player mode.")
+            sys.exit(0)
+
+        if self.render == "none" and self.sound == "on":
+            self.print_logs("ERROR: 'sound' must be 'off' when 'render' is 'none'.")
+            sys.exit(0)
+
+        if self.profile not in ("yes", "no"):
+            self.print_logs("ERROR: 'profile' value must be 'yes' or 'no'.")
+            sys.exit(0)
+
+        if self.stopfitness is not None and not isinstance(
+            self.stopfitness, (int, float)
+        ):
+            self.print_logs("ERROR: 'stopfitness' must be a number or None.")
+            sys.exit(0)
+
+        if type(self.idletime) is not int or self.idletime < 0:
+            self.print_logs("ERROR: 'idletime' must be a non negative integer.")
+            sys.exit(0)
+
         if type(self.timeexpire) is not int:
             self.print_logs("ERROR: 'timeexpire' must be integer.")
             sys.exit(0)
@@ -376,6 +454,20 @@ class Environment(object):
             - numpy.log(self.get_time())
         )
 
+    # best fitness_single the current game can still end with: the enemy can still lose
+    # all its life, while the player can only lose life and the time only grows.
+    # it must be overridden along with fitness_single when using 'stopfitness'
+    def fitness_bound(self):
+        return 0.9 * 100 + 0.1 * self.get_playerlife() - numpy.log(self.get_time())
+
+    # worst fitness_single the current game (ai mode) can still end with: the enemy
+    # keeps its life, the player loses all of it and the game runs until it expires.
+    # it must be overridden along with fitness_single when using 'idletime'
+    def fitness_floor(self):
+        return 0.9 * (100 - self.get_enemylife()) - numpy.log(
+            max(self.get_time(), self.enemy_module.timeexpire)
+        )
+
     # default fitness function for consolidating solutions among multiple games
     def cons_multi(self, values):
         return values.mean() - values.std()
@@ -388,13 +480,58 @@ class Environment(object):
     def get_enemylife(self):
         return self.enemy.life
 
+    # sets where the randomness of the next games comes from (see random_state).
+    # RandomState(seed) draws the same numbers as numpy.random after numpy.random.seed(seed)
+    def set_random(self, seed=None):
+        self.random = random_state(seed)
+
     # gets run time
     def get_time(self):
         return self.time
 
+    # gets the time, calls and memory blocks of every frame phase so far (profile mode)
+    def get_profile(self):
+        return self.profiler.report()
+
+    # writes the frame phases profile to the experiment directory
+    def save_profile(self):
+        file_aux = open(self.experiment_name + "/evoman_profile.json", "w")
+        json.dump(self.get_profile(), file_aux, indent=2)
+        file_aux.close()
+
+    # draws player and enemy life bars on screen
+    def draw_life_bars(self):
+
+        # player life bar
+        vbar = int(100 * (1 - (self.player.life / float(self.player.max_life))))
+        pygame.draw.line(self.screen, (0, 0, 0), [40, 40], [140, 40], 2)
+        pygame.draw.line(self.screen, (0, 0, 0), [40, 45], [140, 45], 5)
+        pygame.draw.line(self.screen, (150, 24, 25), [40, 45], [140 - vbar, 45], 5)
+        pygame.draw.line(self.screen, (0, 0, 0), [40, 49], [140, 49], 2)
+
+        # enemy life bar
+        vbar = int(100 * (1 - (self.enemy.life / float(self.enemy.max_life))))
+        pygame.draw.line(self.screen, (0, 0, 0), [590, 40], [695, 40], 2)
+        pygame.draw.line(self.screen, (0, 0, 0), [590, 45], [695, 45], 5)
+        pygame.draw.line(self.screen, (194, 118, 55), [590, 45], [695 - vbar, 45], 5)
+        pygame.draw.line(self.screen, (0, 0, 0), [590, 49], [695, 49], 2)
+
     # runs game for a single enemy
     def run_single(self, enemyn, pcont, econt):
 
+        self.reset(enemyn, pcont, econt)
+
+        # game main loop
+        while 1:
+            ended, results = self.step()
+            if ended:
+                if self.profiler is not None and self.savelogs == "yes":
+                    self.save_profile()
+                return results
+
+    # prepares a new game against enemy 'enemyn'
+    def reset(self, enemyn, pcont, econt):
+
         # sets controllers
         self.pcont = pcont
         self.econt = econt
@@ -402,180 +539,332 @@ class Environment(object):
         self.checks_params()
 
         self.enemyn = enemyn  # sets the current enemy
-        ends = 0
+        self.ends = 0
         self.time = 0
         self.freeze_p = False
         self.freeze_e = False
         self.start = False
+        self.stopped = None
+        self.idle_state = None
+        self.idle_since = 0
 
-        enemy = __import__("enemy" + str(self.enemyn))
+        self.enemy_module = __import__("enemy" + str(self.enemyn))
+
+        # default random controllers draw from the randomness of the game too
+        # (also when wrapped by the profiler)
+        for controller in (self.player_controller, self.enemy_controller):
+            if isinstance(controller, TimedController):
+                controller = controller.controller
+            if type(controller) is Controller:
+                controller.random = self.random
 
         self.load_sprites()
 
-        # game main loop
+        # charges sensors and controller to their own phases
+        if self.profiler is not None:
+            for sprite in (self.player, self.enemy):
+                sprite.sensors.get = self.profiler.timed("sensors", sprite.sensors.get)
+            if self.playermode == "ai" and not isinstance(
+                self.player_controller, TimedController
+            ):
+                self.player_controller = TimedController(
+                    self.profiler, self.player_controller
+                )
 
-        while 1:
+    # runs one frame of the game: returns (True, results) once the game is over.
+    # results are None when the game window is closed.
+    def step(self):
 
-            # adjusts frames rate for defining game speed
-
-            if self.clockprec == "medium":  # medium clock precision
-                if self.speed == "normal":
-                    self.clock.tick_busy_loop(30)
-                elif self.speed == "fastest":
-                    self.clock.tick_busy_loop()
-
-            else:  # low clock precision
-
-                if self.speed == "normal":
-                    self.clock.tick(30)
-                elif self.speed == "fastest":
-                    self.clock.tick()
-
-            # game timer
-            self.time += 1
-            if self.playermode == "human" or self.sound == "on":
-                # sound effects
-                if self.sound == "on" and self.time == 1:
-                    sound = pygame.mixer.Sound("evoman/sounds/open.wav")
-                    c = pygame.mixer.Channel(1)
-                    c.set_volume(1)
-                    c.play(sound, loops=10)
-
-                if (
-                    self.time > self.overturetime
-                ):  # delays game start a little bit for human mode
-                    self.start = True
-            else:
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.frames += 1
+            profiler.start("other")  # what is not in any of the phases below
+
+        try:
+            if not self.begin_frame():
+                return True, None
+
+            return self.end_frame()
+        finally:
+            if profiler is not None:
+                profiler.stop()
+
+    # updates a layer in profile mode: its sprites are charged to their own phases
+    def update_profiled(self, layer):
+
+        profiler = self.profiler
+        if layer is self.sprite_e or layer is self.sprite_p:
+            for sprite in layer.sprites():
+                if sprite is self.player:
+                    profiler.start("player")
+                elif sprite is self.enemy:
+                    profiler.start("enemy")
+                elif layer is self.sprite_e:
+                    profiler.start("enemy bullets")
+                else:
+                    profiler.start("player bullets")
+                sprite.update(33 / 1000.0, self)
+                profiler.stop()
+        else:
+            profiler.start("map")
+            layer.update(33 / 1000.0, self)
+            profiler.stop()
+
+    # first part of a frame: timer, events and update of everything but the player
+    # layer (the player reads its sensors right after this). Returns False if the
+    # game window was closed.
+    def begin_frame(self):
+
+        profiler = self.profiler
+
+        # adjusts frames rate for defining game speed
+        if profiler is not None:
+            profiler.start("clock")
+
+        if self.clockprec == "medium":  # medium clock precision
+            if self.speed == "normal":
+                self.clock.tick_busy_loop(30)
+            elif self.speed == "fastest":
+                self.clock.tick_busy_loop()
+
+        else:  # low clock precision
+
+            if self.speed == "normal":
+                self.clock.tick(30)
+            elif self.speed == "fastest":
+                self.clock.tick()
+
+        if profiler is not None:
+            profiler.stop()
+
+        # game timer
+        self.time += 1
+        if self.playermode == "human" or self.sound == "on":
+            # sound effects
+            if self.sound == "on" and self.time == 1:
+                sound = pygame.mixer.Sound("evoman/sounds/open.wav")
+                c = pygame.mixer.Channel(1)
+                c.set_volume(1)
+                c.play(sound, loops=10)
+
+            if (
+                self.time > self.overturetime
+            ):  # delays game start a little bit for human mode
                 self.start = True
+        else:
+            self.start = True
+
+        # headless runs have no window, so there are no events to poll
+        if self.render == "none":
+            self.event = []
+        else:
+            if profiler is not None:
+                profiler.start("events")
 
             # checks screen closing button
             self.event = pygame.event.get()
+            closed = False
             for event in self.event:
                 if event.type == pygame.QUIT:
-                    return
+                    closed = True
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    return
+                    closed = True
+
+            if profiler is not None:
+                profiler.stop()
+
+            if closed:
+                return False
+
+            if profiler is not None:
+                profiler.start("draw")
 
-            # updates objects and draws its itens on screen
             self.screen.fill((250, 250, 250))
-            self.tilemap.update(33 / 1000.0, self)
+
+            if profiler is not None:
+                profiler.stop()
+
+        # updates objects (the player layer is the last one)
+        for layer in self.tilemap.layers:
+            if layer is not self.sprite_p:
+                if profiler is None:
+                    layer.update(33 / 1000.0, self)
+                else:
+                    self.update_profiled(layer)
+
+        return True
+
+    # second part of a frame: player layer update, drawing and end of game checks.
+    # Returns (True, results) once the game is over.
+    def end_frame(self):
+
+        profiler = self.profiler
+        if profiler is None:
+            self.sprite_p.update(33 / 1000.0, self)
+        else:
+            self.update_profiled(self.sprite_p)
+
+        # draws its itens on screen
+        if self.render == "display":
+            if profiler is not None:
+                profiler.start("draw")
+
             self.tilemap.draw(self.screen)
+            self.draw_life_bars()
 
-            # player life bar
-            vbar = int(100 * (1 - (self.player.life / float(self.player.max_life))))
-            pygame.draw.line(self.screen, (0, 0, 0), [40, 40], [140, 40], 2)
-            pygame.draw.line(self.screen, (0, 0, 0), [40, 45], [140, 45], 5)
-            pygame.draw.line(self.screen, (150, 24, 25), [40, 45], [140 - vbar, 45], 5)
-            pygame.draw.line(self.screen, (0, 0, 0), [40, 49], [140, 49], 2)
-
-            # enemy life bar
-            vbar = int(100 * (1 - (self.enemy.life / float(self.enemy.max_life))))
-            pygame.draw.line(self.screen, (0, 0, 0), [590, 40], [695, 40], 2)
-            pygame.draw.line(self.screen, (0, 0, 0), [590, 45], [695, 45], 5)
-            pygame.draw.line(
-                self.screen, (194, 118, 55), [590, 45], [695 - vbar, 45], 5
-            )
-            pygame.draw.line(self.screen, (0, 0, 0), [590, 49], [695, 49], 2)
-
-            # gets fitness for training agents
-            fitness = self.fitness_single()
-
-            # returns results of the run
-            def return_run():
-                self.print_logs(
-                    "RUN: run status: enemy: "
-                    + str(self.enemyn)
-                    + "; fitness: "
-                    + str(fitness)
-                    + "; player life: "
-                    + str(self.player.life)
-                    + "; enemy life: "
-                    + str(self.enemy.life)
-                    + "; time: "
-                    + str(self.time)
-                )
+            if profiler is not None:
+                profiler.stop()
 
-                return fitness, self.player.life, self.enemy.life, self.time
+        # gets fitness for training agents
+        fitness = self.fitness_single()
 
-            if self.start == False and self.playermode == "human":
+        if self.start == False and self.playermode == "human":
+
+            myfont = pygame.font.SysFont("Comic sams", 100)
+            pygame.font.Font.set_bold
+            self.screen.blit(myfont.render("Player", 1, (150, 24, 25)), (50, 180))
+            self.screen.blit(myfont.render("  VS  ", 1, (50, 24, 25)), (250, 180))
+            self.screen.blit(
+                myfont.render("Enemy " + str(self.enemyn), 1, (194, 118, 55)),
+                (400, 180),
+            )
 
+        # checks player life status
+        if self.player.life == 0:
+            self.ends -= 1
+
+            # tells user that player has lost
+            if self.playermode == "human":
                 myfont = pygame.font.SysFont("Comic sams", 100)
                 pygame.font.Font.set_bold
-                self.screen.blit(myfont.render("Player", 1, (150, 24, 25)), (50, 180))
-                self.screen.blit(myfont.render("  VS  ", 1, (50, 24, 25)), (250, 180))
                 self.screen.blit(
-                    myfont.render("Enemy " + str(self.enemyn), 1, (194, 118, 55)),
-                    (400, 180),
+                    myfont.render(" Enemy wins", 1, (194, 118, 55)), (150, 180)
                 )
 
-            # checks player life status
-            if self.player.life == 0:
-                ends -= 1
-
-                # tells user that player has lost
-                if self.playermode == "human":
-                    myfont = pygame.font.SysFont("Comic sams", 100)
-                    pygame.font.Font.set_bold
-                    self.screen.blit(
-                        myfont.render(" Enemy wins", 1, (194, 118, 55)), (150, 180)
-                    )
-
-                self.player.kill()  # removes player sprite
-                self.enemy.kill()  # removes enemy sprite
-
-                if self.playermode == "human":
-                    # delays run finalization for human mode
-                    if ends == -self.overturetime:
-                        return return_run()
-                else:
-                    return return_run()
+            self.player.kill()  # removes player sprite
+            self.enemy.kill()  # removes enemy sprite
 
-            # checks enemy life status
-            if self.enemy.life == 0:
-                ends -= 1
+            if self.playermode == "human":
+                # delays run finalization for human mode
+                if self.ends == -self.overturetime:
+                    return True, self.return_run(fitness)
+            else:
+                return True, self.return_run(fitness)
 
+        # checks enemy life status
+        if self.enemy.life == 0:
+            self.ends -= 1
+
+            if self.render == "display":
                 self.screen.fill((250, 250, 250))
                 self.tilemap.draw(self.screen)
 
-                # tells user that player has won
-                if self.playermode == "human":
-                    myfont = pygame.font.SysFont("Comic sams", 100)
-                    pygame.font.Font.set_bold
-                    self.screen.blit(
-                        myfont.render(" Player wins ", 1, (150, 24, 25)), (170, 180)
-                    )
+            # tells user that player has won
+            if self.playermode == "human":
+                myfont = pygame.font.SysFont("Comic sams", 100)
+                pygame.font.Font.set_bold
+                self.screen.blit(
+                    myfont.render(" Player wins ", 1, (150, 24, 25)), (170, 180)
+                )
 
-                self.enemy.kill()  # removes enemy sprite
-                self.player.kill()  # removes player sprite
+            self.enemy.kill()  # removes enemy sprite
+            self.player.kill()  # removes player sprite
 
-                if self.playermode == "human":
-                    if ends == -self.overturetime:
-                        return return_run()
-                else:
-                    return return_run()
+            if self.playermode == "human":
+                if self.ends == -self.overturetime:
+                    return True, self.return_run(fitness)
+            else:
+                return True, self.return_run(fitness)
 
-            if self.loadplayer == "no":  # removes player sprite from game
-                self.player.kill()
+        if self.loadplayer == "no":  # removes player sprite from game
+            self.player.kill()
 
-            if self.loadenemy == "no":  # removes enemy sprite from game
-                self.enemy.kill()
+        if self.loadenemy == "no":  # removes enemy sprite from game
+            self.enemy.kill()
+
+            # updates screen
+        if self.render == "display":
+            if profiler is not None:
+                profiler.start("flip")
 
-                # updates screen
             pygame.display.flip()
 
-            # game runtime limit
-            if self.playermode == "ai":
-                if self.time >= enemy.timeexpire:
-                    return return_run()
+            if profiler is not None:
+                profiler.stop()
 
-            else:
-                if self.time >= self.timeexpire:
-                    return return_run()
+        # early stop policy (ai mode)
+        if self.playermode == "ai":
+            self.stopped = self.check_stop()
+            if self.stopped == "idle":
+                # the game could still go either way: it gets the worst it can end with
+                return True, self.return_run(self.fitness_floor())
+            if self.stopped is not None:
+                return True, self.return_run(fitness)
+
+        # game runtime limit
+        if self.playermode == "ai":
+            if self.time >= self.enemy_module.timeexpire:
+                return True, self.return_run(fitness)
+
+        else:
+            if self.time >= self.timeexpire:
+                return True, self.return_run(fitness)
+
+        return False, None
+
+    # tells why the game should be stopped before it ends, or returns None:
+    #  - "fitness": it can not end with a fitness over 'stopfitness' anymore (see
+    #    fitness_bound). The results are those of the frame it stopped at.
+    #  - "idle": nothing has changed for 'idletime' frames: lives, player and enemy
+    #    positions, live bullets and enemy attack timers. The results are those of the
+    #    frame it stopped at, but the fitness is the lowest the game can still end with
+    #    (see fitness_floor), so stopping never scores better than playing on.
+    def check_stop(self):
+
+        if self.stopfitness is not None and self.fitness_bound() < self.stopfitness:
+            return "fitness"
+
+        if self.idletime:
+            state = (
+                self.player.life,
+                self.enemy.life,
+                tuple(self.player.rect),
+                tuple(self.enemy.rect),
+                tuple(tuple(bullet.rect) for bullet in self.player.twists),
+                tuple(tuple(bullet.rect) for bullet in self.enemy.twists),
+                getattr(self.enemy, "timeenemy", None),
+                getattr(self.enemy, "gun_cooldown", None),
+            )
+            if state != self.idle_state:
+                self.idle_state = state
+                self.idle_since = self.time
+            elif self.time - self.idle_since >= self.idletime:
+                return "idle"
+
+        return None
+
+    # returns results of the run
+    def return_run(self, fitness):
+        self.print_logs(
+            "RUN: run status: enemy: "
+            + str(self.enemyn)
+            + "; fitness: "
+            + str(fitness)
+            + "; player life: "
+            + str(self.player.life)
+            + "; enemy life: "
+            + str(self.enemy.life)
+            + "; time: "
+            + str(self.time)
+            + ("; stopped: " + self.stopped if self.stopped is not None else "")
+        )
+
+        return fitness, self.player.life, self.enemy.life, self.time
 
     # repeats run for every enemy in list
     def multiple(self, pcont, econt):
 
-        vfitness, vplayerlife, venemylife, vtime = [], [], [], []
+        vfitness, vplayerlife, venemylife, vtime, vstopped = [], [], [], [], []
         for e in self.enemies:
 
             fitness, playerlife, enemylife, time = self.run_single(e, pcont, econt)
@@ -583,6 +872,10 @@ class Environment(object):
             vplayerlife.append(playerlife)
             venemylife.append(enemylife)
             vtime.append(time)
+            vstopped.append(self.stopped)
+
+        # early stops of every enemy, so none is hidden by the games after it
+        self.stopped = vstopped
 
         vfitness = self.cons_multi(numpy.array(vfitness))
         vplayerlife = self.cons_multi(numpy.array(vplayerlife))
@@ -592,7 +885,12 @@ class Environment(object):
         return vfitness, vplayerlife, venemylife, vtime
 
     # checks objective mode
-    def play(self, pcont="None", econt="None"):
+    # seed: seeds the games (see random_state); without it they keep drawing from the
+    # current source of randomness (set_random), by default the global numpy.random state
+    def play(self, pcont="None", econt="None", seed=None):
+
+        if seed is not None:
+            self.set_random(seed)
 
         if self.multiplemode == "yes":
             return self.multiple(pcont, econt)
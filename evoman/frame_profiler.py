@@ -0,0 +1,91 @@
+# accumulates where the time of the game frames goes, phase by phase (clock, events, map,
+# enemy, enemy bullets, player, player bullets, sensors, controller, draw, flip, end checks).
+# phases can be nested (sensors and controller run inside the player update): every phase
+# is charged only its own time, not the time of the phases running inside it.
+# besides time and calls, the net change of the memory blocks python has allocated
+# (sys.getallocatedblocks) is accumulated per phase, which shows the phases that leave
+# objects behind or churn memory; it is not a count of every allocation.
+
+import sys
+import time
+
+
+class FrameProfiler(object):
+    def __init__(self):
+        self.totals = {}  # phase: [seconds, calls, blocks]
+        self.stack = []  # [phase, start time, start blocks] of the running phases
+        self.frames = 0
+
+    # charges the running phase with the time and blocks since it was last charged
+    def charge(self, entry, now, blocks):
+        total = self.totals.setdefault(entry[0], [0.0, 0, 0])
+        total[0] += now - entry[1]
+        total[2] += blocks - entry[2]
+        entry[1] = now
+        entry[2] = blocks
+
+    def start(self, phase):
+        # the entry is created before measuring, so it is not charged to any phase
+        entry = [phase, 0.0, 0]
+        now = time.perf_counter()
+        blocks = sys.getallocatedblocks()
+        if self.stack:
+            self.charge(self.stack[-1], now, blocks)
+        entry[1] = now
+        entry[2] = blocks
+        self.stack.append(entry)
+
+    def stop(self):
+        now = time.perf_counter()
+        blocks = sys.getallocatedblocks()
+        entry = self.stack.pop()
+        self.charge(entry, now, blocks)
+        self.totals[entry[0]][1] += 1
+        if self.stack:
+            # the phase that was running resumes now
+            self.stack[-1][1] = now
+            self.stack[-1][2] = blocks
+
+    # returns 'function' wrapped so that its calls are charged to 'phase'
+    def timed(self, phase, function):
+        def timed_function(*args, **kwargs):
+            self.start(phase)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.stop()
+
+        timed_function.__wrapped__ = function
+        return timed_function
+
+    # totals per phase, plus the number of frames profiled
+    def report(self):
+        phases = {}
+        for phase, (seconds, calls, blocks) in self.totals.items():
+            phases[phase] = {
+                "seconds": seconds,
+                "calls": calls,
+                "blocks": blocks,
+                "seconds_per_frame": seconds / max(1, self.frames),
+            }
+        return {"frames": self.frames, "phases": phases}
+
+
+# player controller of a profiled game: charges the calls to the "controller" phase
+class TimedController(object):
+    def __init__(self, profiler, controller):
+        self.profiler = profiler
+        self.controller = controller
+
+    def control(self, inputs, controller=None):
+        self.profiler.start("controller")
+        try:
+            return self.controller.control(inputs, controller)
+        finally:
+            self.profiler.stop()
+
+    # everything else is the wrapped controller's
+    def __getattr__(self, name):
+        if name == "controller":  # not set yet, e.g. while unpickling
+            raise AttributeError(name)
+        return getattr(self.controller, name)
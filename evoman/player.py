@@ -12,13 +12,16 @@ import binascii
 import Base
 from Base.SpriteConstants import *
 from Base.SpriteDefinition import *
+from Base.ImageCache import load_image
+from Base.Twists import Twists
 from sensors import *
+from tmx import BLOCKER_L, BLOCKER_R, BLOCKER_T, BLOCKER_B, KILLERS
 
 
 # player proctile
 class Bullet_p(pygame.sprite.Sprite):
 
-    image = pygame.image.load("evoman/images/bullet_r.png")
+    image = load_image("evoman/images/bullet_r.png")
 
     def __init__(self, location, direction, n_twist, *groups):
         super(Bullet_p, self).__init__(*groups)
@@ -29,9 +32,9 @@ class Bullet_p(pygame.sprite.Sprite):
 
         # fits image according to the side the player is turned to
         if self.direction == 1:
-            self.image = pygame.image.load("evoman/images/bullet_r.png")
+            self.image = load_image("evoman/images/bullet_r.png")
         else:
-            self.image = pygame.image.load("evoman/images/bullet_l.png")
+            self.image = load_image("evoman/images/bullet_l.png")
 
     def update(self, dt, game):
 
@@ -43,7 +46,7 @@ class Bullet_p(pygame.sprite.Sprite):
             or self.rect.bottom > 512
         ):
             self.kill()
-            game.player.twists[self.n_twist] = None
+            game.player.twists.discard(self.n_twist)
             return
 
         self.rect.x += (
@@ -64,7 +67,7 @@ class Bullet_p(pygame.sprite.Sprite):
 
             # removes the bullet off the screen after collision.
             self.kill()
-            game.player.twists[self.n_twist] = None
+            game.player.twists.discard(self.n_twist)
 
             game.enemy.hurt = 5
 
@@ -91,7 +94,7 @@ class Player(pygame.sprite.Sprite):
         self.hurt = 0
         self.shooting = 0
         self.inwater = 0
-        self.twists = []
+        self.twists = Twists()
         self.vx = 0
         self.vy = 0
         self.hy = 0
@@ -273,12 +276,12 @@ class Player(pygame.sprite.Sprite):
 
             # controls screen walls and platforms limits agaist player
             self.resting = 0
-            for cell in game.tilemap.layers["triggers"].collide(new, "blockers"):
+            for cell in game.tilemap.layers["triggers"].collide_blockers(new):
 
-                blockers = cell["blockers"]
+                blockers = cell.flags
 
                 if (
-                    "l" in blockers
+                    blockers & BLOCKER_L
                     and last.right <= cell.left
                     and new.right > cell.left
                     and last.bottom > cell.top
@@ -286,7 +289,7 @@ class Player(pygame.sprite.Sprite):
                     new.right = cell.left
 
                 if (
-                    "r" in blockers
+                    blockers & BLOCKER_R
                     and last.left >= cell.right
                     and new.left < cell.right
                     and last.bottom > cell.top
@@ -294,7 +297,7 @@ class Player(pygame.sprite.Sprite):
                     new.left = cell.right
 
                 if (
-                    "t" in blockers
+                    blockers & BLOCKER_T
                     and last.bottom <= cell.top
                     and new.bottom > cell.top
                 ):
@@ -303,7 +306,7 @@ class Player(pygame.sprite.Sprite):
                     self.dy = 0
 
                 if (
-                    "b" in blockers
+                    blockers & BLOCKER_B
                     and last.top >= cell.bottom
                     and new.top < cell.bottom
                 ):
@@ -318,12 +321,12 @@ class Player(pygame.sprite.Sprite):
                 # creates bullets objects according to the direction.
                 if self.direction > 0:
                     self.twists.append(
-                        Bullet_p(self.rect.midright, 1, len(self.twists), game.sprite_p)
+                        Bullet_p(self.rect.midright, 1, self.twists.shot, game.sprite_p)
                     )
 
                 else:
                     self.twists.append(
-                        Bullet_p(self.rect.midleft, -1, len(self.twists), game.sprite_p)
+                        Bullet_p(self.rect.midleft, -1, self.twists.shot, game.sprite_p)
                     )
 
                 self.gun_cooldown = (
@@ -377,7 +380,7 @@ class Player(pygame.sprite.Sprite):
                         )
 
             # kills player in case he touches killers stuff, like spikes.
-            for cell in game.tilemap.layers["triggers"].collide(self.rect, "killers"):
+            if game.tilemap.layers["triggers"].collide_flags(self.rect) & KILLERS:
                 game.player.life = 0
 
             # focuses screen center on player
@@ -4,48 +4,49 @@ import binascii
 
 # sensors for the controllers
 class Sensors:
-    def get(self, game):
+
+    # number of values read: distances to the enemy, directions of both sprites and
+    # distances to at most 8 enemy bullets
+    size = 20
+
+    def __init__(self):
+        # filled in place on every get, instead of allocating new arrays each frame
+        self.buffer = numpy.zeros(self.size)
+
+    # the values are written to 'out' (by default the buffer of this instance) and it is
+    # returned, so they are only valid until the next call
+    def get(self, game, out=None):
+
+        if out is None:
+            out = self.buffer
 
         # calculates vertical and horizontal distances between sprites centers
+        player = game.player.rect
+        enemy = game.enemy.rect
 
-        posx_p = game.player.rect.left + (
-            (game.player.rect.right - game.player.rect.left) / 2
-        )
-        posy_p = game.player.rect.bottom + (
-            (game.player.rect.top - game.player.rect.bottom) / 2
-        )
-        posx_e = game.enemy.rect.left + (
-            (game.enemy.rect.right - game.enemy.rect.left) / 2
-        )
-        posy_e = game.enemy.rect.bottom + (
-            (game.enemy.rect.top - game.enemy.rect.bottom) / 2
-        )
+        posx_p = player.left + ((player.right - player.left) / 2)
+        posy_p = player.bottom + ((player.top - player.bottom) / 2)
+        posx_e = enemy.left + ((enemy.right - enemy.left) / 2)
+        posy_e = enemy.bottom + ((enemy.top - enemy.bottom) / 2)
 
-        param_values = [
-            posx_p - posx_e,
-            posy_p - posy_e,
-            game.player.direction,
-            game.enemy.direction,
-        ]
+        out[0] = posx_p - posx_e
+        out[1] = posy_p - posy_e
+        out[2] = game.player.direction
+        out[3] = game.enemy.direction
 
         # calculates vertical and horizontal distances between player and the center of enemy's bullets
-        for i in range(0, len(game.enemy.twists)):
-            if game.enemy.twists[i] != None:
-                posx_be = game.enemy.twists[i].rect.left + (
-                    (game.enemy.twists[i].rect.right - game.enemy.twists[i].rect.left)
-                    / 2
-                )
-                posy_be = game.enemy.twists[i].rect.bottom + (
-                    (game.enemy.twists[i].rect.top - game.enemy.twists[i].rect.bottom)
-                    / 2
-                )
-                param_values.append(posx_p - posx_be)
-                param_values.append(posy_p - posy_be)
+        n = 4
+        for twist in game.enemy.twists:
+            if n == len(out):
+                # more bullets than places for them: the result grows, as it always did
+                out = numpy.concatenate((out, numpy.zeros(2)))
+            rect = twist.rect
+            out[n] = posx_p - (rect.left + ((rect.right - rect.left) / 2))
+            out[n + 1] = posy_p - (rect.bottom + ((rect.top - rect.bottom) / 2))
+            n += 2
 
         # treats cases when not all bullets are used
-        for i in range(0, 8 - len([t for t in game.enemy.twists if t != None])):
-            param_values.append(0)
-            param_values.append(0)
+        out[n:] = 0
 
         # applies several transformations to input variables (sensors)
         if game.inputscoded == "yes":
@@ -53,7 +54,7 @@ class Sensors:
             types = struct.Struct(
                 "q q q q q q q q q q q q q q q q q q q q"
             )  # defines the data types of each item of the array that will be packed. (q=int, f=flo)
-            packed_data = types.pack(*param_values)  # packs data as struct
+            packed_data = types.pack(*out.tolist())  # packs data as struct
             coded_variables = binascii.hexlify(
                 packed_data
             )  # converts packed data to an hexadecimal string
@@ -64,8 +65,8 @@ class Sensors:
                 map(lambda y: int(y, 16), coded_variables)
             )  # converts bytes to integer
 
-            param_values = coded_variables
+            out = coded_variables
 
-        self.sensors = param_values  # defines sensors state
+        self.sensors = out  # defines sensors state
 
-        return numpy.array(self.sensors)
+        return out
@@ -8,6 +8,8 @@
 
 import sys
 import struct
+import numpy
+from collections import namedtuple
 import pygame
 from pygame.locals import *
 from pygame import Rect
@@ -16,6 +18,40 @@ from base64 import b64decode
 from zlib import decompress
 
 
+# bits of the collision flags precomputed for the cells of a Layer and the objects
+# of an ObjectLayer: BLOCKERS and KILLERS mark the property, the other bits tell
+# which sides ("l", "r", "t", "b") the blockers value lists
+BLOCKERS = 1
+BLOCKER_L = 2
+BLOCKER_R = 4
+BLOCKER_T = 8
+BLOCKER_B = 16
+KILLERS = 32
+
+FLAG_BITS = {"blockers": BLOCKERS, "killers": KILLERS}
+SIDE_BITS = (("l", BLOCKER_L), ("r", BLOCKER_R), ("t", BLOCKER_T), ("b", BLOCKER_B))
+
+
+# edges of an object with the "blockers" property, and the sides it blocks as flags
+Blocker = namedtuple("Blocker", "left top right bottom flags")
+
+
+def collision_flags(properties):
+    """Return the collision flags of something with the given properties (anything
+    supporting "in" and item access, like a dict, a Cell or an Object).
+    """
+    flags = 0
+    if "blockers" in properties:
+        blockers = properties["blockers"]
+        flags |= BLOCKERS
+        for side, bit in SIDE_BITS:
+            if side in blockers:
+                flags |= bit
+    if "killers" in properties:
+        flags |= KILLERS
+    return flags
+
+
 class Tile(object):
     def __init__(self, gid, surface, tileset):
         self.gid = gid
@@ -90,7 +126,10 @@ class Tileset(object):
         return tileset
 
     def add_image(self, file):
-        image = pygame.image.load(file).convert_alpha()
+        image = pygame.image.load(file)
+        # converting to the screen pixel format needs a display (absent when headless)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
         if not image:
             sys.exit("Error creating new Tileset: file %s not found" % file)
         id = self.firstgid
@@ -216,12 +255,19 @@ class Layer(object):
         properties - any properties set for this Layer
         cells - a dict of all the Cell instances for this Layer, keyed off
                 (x, y) index.
+        gids - a numpy array of the tile gid of every cell, indexed [x, y]
+               (0 for empty cells)
+        flags - a numpy array of the collision flags (BLOCKERS, KILLERS, ...)
+                of every cell's tile, indexed [x, y]
 
     Additionally you may look up a cell using direct item access:
 
        layer[x, y] is layer.cells[x, y]
 
     Note that empty cells will be set to None instead of a Cell instance.
+
+    gids and flags are kept up to date when cells are set through layer[x, y];
+    properties changed on a single Cell are not reflected in flags.
     """
 
     def __init__(self, name, visible, map):
@@ -239,6 +285,8 @@ class Layer(object):
         self.group = pygame.sprite.Group()
         self.properties = {}
         self.cells = {}
+        self.gids = numpy.zeros((self.width, self.height), numpy.int32)
+        self.flags = numpy.zeros((self.width, self.height), numpy.uint8)
 
     def __repr__(self):
         return '<Layer "%s" at 0x%x>' % (self.name, id(self))
@@ -251,6 +299,8 @@ class Layer(object):
         px = x * self.tile_width
         py = y * self.tile_width
         self.cells[pos] = Cell(x, y, px, py, tile)
+        self.gids[x, y] = tile.gid
+        self.flags[x, y] = collision_flags(tile.properties)
 
     def __iter__(self):
         return LayerIterator(self)
@@ -278,6 +328,8 @@ class Layer(object):
             layer.cells[x, y] = Cell(
                 x, y, x * map.tile_width, y * map.tile_height, tile
             )
+            layer.gids[x, y] = gid
+            layer.flags[x, y] = collision_flags(tile.properties)
 
         return layer
 
@@ -328,6 +380,15 @@ class Layer(object):
         """Find all cells the rect is touching that have the indicated property
         name set.
         """
+        bit = FLAG_BITS.get(propname)
+        if bit is not None:
+            # the precomputed flags tell which cells have the property
+            i1, j1, i2, j2 = self.touched_region(rect)
+            found = numpy.nonzero(self.flags[i1:i2, j1:j2] & bit)
+            return [
+                self.cells[i1 + int(i), j1 + int(j)] for i, j in zip(*found)
+            ]
+
         r = []
         for cell in self.get_in_region(rect.left, rect.top, rect.right, rect.bottom):
             if not cell.intersects(rect):
@@ -336,6 +397,26 @@ class Layer(object):
                 r.append(cell)
         return r
 
+    def collide_flags(self, rect):
+        """Return the collision flags of all the cells the rect is touching,
+        OR-ed together, without building any list of cells.
+        """
+        i1, j1, i2, j2 = self.touched_region(rect)
+        if i1 >= i2 or j1 >= j2:
+            return 0
+        return int(numpy.bitwise_or.reduce(self.flags[i1:i2, j1:j2], axis=None))
+
+    def touched_region(self, rect):
+        """Return the (i1, j1, i2, j2) index bounds of the cells the rect is
+        touching (the cells get_in_region returns that Cell.intersects the rect).
+        """
+        tw, th = self.tile_width, self.tile_height
+        i1 = max(0, rect.left // tw, (rect.x - 1) // tw)
+        j1 = max(0, rect.top // th, (rect.y - 1) // th)
+        i2 = min(self.width, rect.right // tw + 1, (rect.x + rect.width - 1) // tw + 1)
+        j2 = min(self.height, rect.bottom // th + 1, (rect.y + rect.height - 1) // th + 1)
+        return int(i1), int(j1), int(i2), int(j2)
+
     def get_in_region(self, x1, y1, x2, y2):
         """Return cells (in [column][row]) that are within the map-space
         pixel bounds specified by the bottom-left (x1, y1) and top-right
@@ -533,6 +614,14 @@ class ObjectLayer(object):
         opacity - the opacity of the layer as a value from 0 to 1.
         visible - whether the layer is shown (1) or hidden (0).
         objects - the objects in this Layer (Object instances)
+        boxes - (left, top, right, bottom, flags, object) for every object, with
+                its collision flags (BLOCKERS, KILLERS, ...) precomputed. It is
+                built by index_objects(), which must be called again if objects
+                or their properties change.
+        blockers - a Blocker for each object with the "blockers" property, in
+                   the order of objects; its flags tell which sides block
+                   (BLOCKER_L, BLOCKER_R, BLOCKER_T, BLOCKER_B). Also built by
+                   index_objects().
     """
 
     def __init__(self, name, color, objects, opacity=1, visible=1, position=(0, 0)):
@@ -543,10 +632,37 @@ class ObjectLayer(object):
         self.visible = visible
         self.position = position
         self.properties = {}
+        self.boxes = None
+        self.blockers = None
 
     def __repr__(self):
         return '<ObjectLayer "%s" at 0x%x>' % (self.name, id(self))
 
+    def index_objects(self):
+        """Precompute the bounds and collision flags of every object."""
+        layer_flags = 0
+        if "blockers" in self.properties:
+            layer_flags |= BLOCKERS
+        if "killers" in self.properties:
+            layer_flags |= KILLERS
+
+        self.boxes = [
+            (
+                object.px,
+                object.py,
+                object.px + object.width,
+                object.py + object.height,
+                collision_flags(object) | layer_flags,
+                object,
+            )
+            for object in self.objects
+        ]
+        self.blockers = [
+            Blocker(left, top, right, bottom, flags)
+            for left, top, right, bottom, flags, object in self.boxes
+            if flags & BLOCKERS
+        ]
+
     @classmethod
     def fromxml(cls, tag, map):
         layer = cls(
@@ -567,6 +683,7 @@ class ObjectLayer(object):
             if value.isdigit():
                 value = int(value)
             layer.properties[name] = value
+        layer.index_objects()
         return layer
 
     def update(self, dt, *args):
@@ -616,12 +733,53 @@ class ObjectLayer(object):
         """Find all objects the rect is touching that have the indicated
         property name set.
         """
+        bit = FLAG_BITS.get(propname)
+        if bit is not None and self.boxes is not None:
+            # same test as Object.intersects, on the precomputed bounds and flags
+            x1, y1, x2, y2 = rect.left, rect.top, rect.right, rect.bottom
+            return [
+                object
+                for left, top, right, bottom, flags, object in self.boxes
+                if flags & bit
+                and x2 >= left
+                and y2 >= top
+                and x1 <= right
+                and y1 <= bottom
+            ]
+
         r = []
         for object in self.get_in_region(rect.left, rect.top, rect.right, rect.bottom):
             if propname in object or propname in self.properties:
                 r.append(object)
         return r
 
+    def collide_blockers(self, rect):
+        """Find all the blockers the rect is touching.
+
+        Return a list of Blocker instances, in the same order
+        collide(rect, "blockers") returns the objects.
+        """
+        x1, y1, x2, y2 = rect.left, rect.top, rect.right, rect.bottom
+        return [
+            blocker
+            for blocker in self.blockers
+            if x2 >= blocker[0]
+            and y2 >= blocker[1]
+            and x1 <= blocker[2]
+            and y1 <= blocker[3]
+        ]
+
+    def collide_flags(self, rect):
+        """Return the collision flags of all the objects the rect is touching,
+        OR-ed together, without building any list of objects.
+        """
+        x1, y1, x2, y2 = rect.left, rect.top, rect.right, rect.bottom
+        r = 0
+        for left, top, right, bottom, flags, object in self.boxes:
+            if x2 >= left and y2 >= top and x1 <= right and y1 <= bottom:
+                r |= flags
+        return r
+
     def get_in_region(self, x1, y1, x2, y2):
         """Return objects that are within the map-space
         pixel bounds specified by the bottom-left (x1, y1) and top-right
@@ -759,6 +917,27 @@ class TileMap(object):
 
         return tilemap
 
+    def copy(self):
+        """Return a new TileMap sharing this one's tilesets and layers.
+
+        The copy has its own Layers list and viewport, so SpriteLayers added to it
+        and its focus do not affect this TileMap. The static layers themselves are
+        shared: their cells must not be changed, and only one of the TileMaps
+        sharing them should be drawn at a time (drawing uses the layer's view).
+        """
+        tilemap = TileMap((self.view_w, self.view_h), (self.view_x, self.view_y))
+        tilemap.width = self.width
+        tilemap.height = self.height
+        tilemap.tile_width = self.tile_width
+        tilemap.tile_height = self.tile_height
+        tilemap.px_width = self.px_width
+        tilemap.px_height = self.px_height
+        tilemap.properties = self.properties
+        tilemap.tilesets = self.tilesets
+        tilemap.layers.extend(self.layers)
+        tilemap.layers.by_name.update(self.layers.by_name)
+        return tilemap
+
     _old_focus = None
 
     def set_focus(self, fx, fy, force=False):
@@ -873,6 +1052,23 @@ def load(filename, viewport):
     return TileMap.load(filename, viewport)
 
 
+# maps already parsed in this process
+maps = {}
+
+
+def load_cached(filename, viewport):
+    """Like load(), but each file is parsed only once per process.
+
+    Every call returns a new TileMap (see TileMap.copy) whose static layers and
+    tilesets are shared with the other maps loaded from the same file.
+    """
+    # tileset images are converted only when there is a display
+    key = (filename, tuple(viewport), pygame.display.get_surface() is not None)
+    if key not in maps:
+        maps[key] = TileMap.load(filename, viewport)
+    return maps[key].copy()
+
+
 if __name__ == "__main__":
     # allow image load to work
     pygame.init()
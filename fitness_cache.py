@@ -0,0 +1,110 @@
+# cache of evaluation results, so individuals whose genes did not change (selection clones,
+# crossovers of identical parents, mutations clipped back to the bounds...) are not played again.
+# results are keyed by the genes and by the settings that decide the outcome of a game, which
+# must include how the game is seeded: caching only gives the same results as evaluating when
+# an individual always plays the same games (as with the seeds of ParallelEvaluator).
+import hashlib
+import pickle
+import sqlite3
+import numpy as np
+from collections import OrderedDict
+
+
+# settings of an environment that decide the outcome of the games it plays.
+# anything else that does (like the base seed of the evaluator) goes in 'extra'
+def environment_settings(env, **extra):
+    settings = {
+        "enemies": list(env.enemies),
+        "multiplemode": env.multiplemode,
+        "level": env.level,
+        "playermode": env.playermode,
+        "enemymode": env.enemymode,
+        "contacthurt": env.contacthurt,
+        "randomini": env.randomini,
+        "inputscoded": env.inputscoded,
+        "timeexpire": env.timeexpire,
+        "stopfitness": env.stopfitness,
+        "idletime": env.idletime,
+        "player_controller": type(env.player_controller).__name__,
+        "n_hidden": getattr(env.player_controller, "n_hidden", None),
+    }
+    settings.update(extra)
+    return settings
+
+
+class FitnessCache(object):
+    """Least recently used cache of evaluation results, optionally backed by an SQLite file.
+
+    Keys are hashes of the genes and of 'settings' (a dict, see environment_settings).
+    At most 'size' results are kept in memory; with 'file_name' every result is also
+    written to that SQLite file and looked up there on a miss, so results are kept
+    across runs.
+    """
+
+    def __init__(self, settings, size=10000, file_name=None):
+        self.settings = repr(sorted(settings.items())).encode()
+        self.size = size
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.db = None
+        if file_name is not None:
+            self.db = sqlite3.connect(file_name)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS fitness (key TEXT PRIMARY KEY, result BLOB)"
+            )
+
+    # 'extra' is anything else the result depends on, like the seeds the individual plays
+    def key(self, individual, extra=None):
+        genes = np.ascontiguousarray(individual, dtype=np.float64)
+        key = hashlib.sha1(self.settings + genes.tobytes())
+        if extra is not None:
+            key.update(repr(extra).encode())
+        return key.hexdigest()
+
+    # returns the result cached for 'key', or None
+    def get(self, key):
+        if key in self.results:
+            self.results.move_to_end(key)
+            self.hits += 1
+            return self.results[key]
+
+        if self.db is not None:
+            row = self.db.execute(
+                "SELECT result FROM fitness WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self.hits += 1
+                result = pickle.loads(row[0])
+                self.remember(key, result)
+                return result
+
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        self.remember(key, result)
+        if self.db is not None:
+            self.db.execute(
+                "INSERT OR REPLACE INTO fitness VALUES (?, ?)",
+                (key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)),
+            )
+
+    # keeps 'result' in memory, forgetting the least recently used one if full
+    def remember(self, key, result):
+        self.results[key] = result
+        self.results.move_to_end(key)
+        if len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+    # writes the results put since the last commit to the file
+    def commit(self):
+        if self.db is not None:
+            self.db.commit()
+
+    def close(self):
+        if self.db is not None:
+            self.db.commit()
+            self.db.close()
+            self.db = None
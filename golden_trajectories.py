@@ -0,0 +1,298 @@
+# records golden trajectories of the game and checks other implementations against them.
+# a trajectory is the per-frame state of one game (a genome against an enemy, with a fixed seed):
+# the sensors read and the actions taken by the player controller, the player and enemy rects,
+# both lives and the game time. any fast path (headless rendering, batched controllers,
+# vectorised collisions...) must reproduce the recorded trajectories frame by frame.
+# the engine is anything with the Environment game loop interface: set_random(seed),
+# reset(enemyn, pcont, econt) and step(), and the player, enemy and time attributes;
+# or a BatchEnvironment, whose games are recorded frame by frame as run_batch plays them.
+import sys, os
+
+sys.path.insert(0, "evoman")
+from environment import Environment
+from batch_environment import BatchEnvironment, BatchActions
+from controller import Controller
+from demo_controller import player_controller
+import numpy as np
+
+
+FIELDS = ("sensors", "actions", "player_rect", "enemy_rect", "life", "time")
+
+
+# wraps the player controller, keeping the last sensors it was given and the actions it took
+class RecordingController(Controller):
+    def __init__(self, controller):
+        self.controller = controller
+        self.inputs = None
+        self.actions = None
+
+    def control(self, inputs, controller=None):
+        actions = self.controller.control(inputs, controller)
+        # the sensors buffer is reused every frame, so it is copied
+        self.inputs = np.array(inputs, dtype=float)
+        self.actions = list(actions)
+        return actions
+
+
+# player controller of a batched game that keeps the sensors it was given and the actions
+# it played
+class RecordingBatchActions(BatchActions):
+    def __init__(self):
+        BatchActions.__init__(self)
+        self.inputs = None
+        self.taken = None
+
+    def control(self, params, cont=None):
+        self.inputs = np.array(params, dtype=float)
+        self.taken = list(self.actions)
+        return self.actions
+
+
+# state of a game after a frame, as recorded in the trajectories
+def frame_state(env, inputs, actions):
+    return (
+        inputs,
+        actions,
+        tuple(env.player.rect),
+        tuple(env.enemy.rect),
+        (env.get_playerlife(), env.get_enemylife()),
+        env.time,
+    )
+
+
+# stacks rows of different lengths (or None for frames without them) in one array
+def stack(rows, fill, dtype):
+    width = max([len(row) for row in rows if row is not None] or [0])
+    array = np.full((len(rows), width), fill, dtype=dtype)
+    for i, row in enumerate(rows):
+        if row is not None:
+            array[i, : len(row)] = row
+    return array
+
+
+# per-frame states of a game as a dict of per-frame arrays (see FIELDS)
+def trajectory(frames):
+    sensors, actions, player_rect, enemy_rect, life, time = zip(*frames)
+    return {
+        "sensors": stack(sensors, np.nan, float),
+        "actions": stack(actions, -1, int),
+        "player_rect": np.array(player_rect, dtype=int),
+        "enemy_rect": np.array(enemy_rect, dtype=int),
+        "life": np.array(life, dtype=float),
+        "time": np.array(time, dtype=int),
+    }
+
+
+# plays one game and returns its trajectory
+def record_episode(env, pcont, enemy, seed, econt=None):
+
+    recorder = RecordingController(env.player_controller)
+    player_controller = env.player_controller
+    env.player_controller = recorder
+
+    try:
+        env.set_random(seed)
+        env.reset(enemy, pcont, econt)
+
+        frames = []
+        ended = False
+        while not ended:
+            recorder.inputs = recorder.actions = None
+            ended, results = env.step()
+            if results is None and ended:
+                break  # window closed
+            frames.append(frame_state(env, recorder.inputs, recorder.actions))
+    finally:
+        env.player_controller = player_controller
+
+    return trajectory(frames)
+
+
+# returns end_frame of the game 'env' of a batch, recording the state after every frame
+def recording_end_frame(env, recorder, frames):
+    end_frame = env.end_frame
+
+    def recorded_end_frame():
+        recorder.inputs = recorder.taken = None
+        ended, results = end_frame()
+        frames.append(frame_state(env, recorder.inputs, recorder.taken))
+        return ended, results
+
+    return recorded_end_frame
+
+
+# plays the (genome, enemy, seed) 'episodes' with a BatchEnvironment, each enemy in
+# batches of its size. returns their trajectories in the same order
+def record_batch(benv, episodes, econt=None):
+
+    size = len(benv.envs)
+    trajectories = [None] * len(episodes)
+    for enemy in sorted(set(e for g, e, s in episodes)):
+        indices = [i for i, (g, e, s) in enumerate(episodes) if e == enemy]
+
+        for first in range(0, len(indices), size):
+            batch = indices[first : first + size]
+            envs = benv.envs[: len(batch)]
+            frames = [[] for i in batch]
+
+            try:
+                for env, env_frames in zip(envs, frames):
+                    env.player_controller = RecordingBatchActions()
+                    env.end_frame = recording_end_frame(
+                        env, env.player_controller, env_frames
+                    )
+                benv.run_batch(
+                    enemy,
+                    [episodes[i][0] for i in batch],
+                    econt,
+                    [episodes[i][2] for i in batch],
+                )
+            finally:
+                for env in envs:
+                    env.player_controller = BatchActions()
+                    del env.end_frame  # back to the Environment method
+
+            for i, env_frames in zip(batch, frames):
+                trajectories[i] = trajectory(env_frames)
+    return trajectories
+
+
+def episode_name(genome, enemy, seed):
+    return "g%d_e%d_s%d" % (genome, enemy, seed)
+
+
+# plays the (genome index, enemy, seed) 'episodes' with 'env' (an engine or a
+# BatchEnvironment). returns a dict of trajectories keyed by episode_name
+def play_episodes(env, genomes, episodes):
+    if isinstance(env, BatchEnvironment):
+        played = record_batch(env, [(genomes[g], e, s) for g, e, s in episodes])
+    else:
+        played = [record_episode(env, genomes[g], e, s) for g, e, s in episodes]
+    return dict((episode_name(*episode), t) for episode, t in zip(episodes, played))
+
+
+# plays every genome against every enemy with every seed
+def record(env, genomes, enemies, seeds):
+    episodes = [
+        (g, enemy, seed)
+        for g in range(len(genomes))
+        for enemy in enemies
+        for seed in seeds
+    ]
+    return play_episodes(env, genomes, episodes)
+
+
+def save(file_name, trajectories):
+    arrays = {}
+    for name, trajectory in trajectories.items():
+        for field in FIELDS:
+            arrays[name + "." + field] = trajectory[field]
+    np.savez_compressed(file_name, **arrays)
+
+
+def load(file_name):
+    trajectories = {}
+    with np.load(file_name) as data:
+        for key in data.files:
+            name, field = key.rsplit(".", 1)
+            trajectories.setdefault(name, {})[field] = data[key]
+    return trajectories
+
+
+# returns (frame, field, expected, found) for the first frame where the trajectories
+# differ, or None if they are the same. frame is the length of the shorter trajectory
+# when one of them is a prefix of the other (field is then "length").
+# float fields are compared with tolerance 'atol' (nan equal to nan).
+def first_divergence(golden, trajectory, atol=0.0):
+
+    frames = min(len(golden["time"]), len(trajectory["time"]))
+
+    first = None
+    for field in FIELDS:
+        expected = golden[field][:frames]
+        found = trajectory[field][:frames]
+        if expected.shape[1:] != found.shape[1:]:
+            return (0, field, expected.shape[1:], found.shape[1:])
+
+        if expected.dtype.kind == "f":
+            same = np.isclose(expected, found, rtol=0.0, atol=atol, equal_nan=True)
+        else:
+            same = expected == found
+        if same.ndim > 1:
+            same = same.all(axis=tuple(range(1, same.ndim)))
+
+        wrong = np.flatnonzero(~same)
+        if len(wrong) and (first is None or wrong[0] < first[0]):
+            first = (int(wrong[0]), field, golden[field][wrong[0]], trajectory[field][wrong[0]])
+
+    if first is None and len(golden["time"]) != len(trajectory["time"]):
+        first = (frames, "length", len(golden["time"]), len(trajectory["time"]))
+    return first
+
+
+# checks the trajectories recorded from 'env' against the golden ones.
+# returns a dict with the first divergence of every episode that diverged
+def check(env, genomes, golden, atol=0.0):
+    episodes = [
+        tuple(int(part[1:]) for part in name.split("_")) for name in sorted(golden)
+    ]
+    trajectories = play_episodes(env, genomes, episodes)
+
+    divergences = {}
+    for name in sorted(golden):
+        divergence = first_divergence(golden[name], trajectories[name], atol)
+        if divergence is not None:
+            divergences[name] = divergence
+    return divergences
+
+
+if __name__ == "__main__":
+
+    # CONFIGURATION
+    mode = "record"  # Either record (writes the golden file) or check (compares against it)
+    golden_file = "golden_trajectories.npz"
+    render = "none"  # display or none, the engine recorded or checked
+    batch = False  # records or checks the batched engine (BatchEnvironment, headless)
+    enemies = [1, 2, 3, 4, 5, 6, 7, 8]
+    seeds = [0, 1]
+    genome_files = [
+        "ea1_deap_enemies278_new/ea1_deap_enemies278_new_run1/best.txt",
+        "ea1_deap_enemies78_new/ea1_deap_enemies78_new_run1/best.txt",
+    ]
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    experiment_name = "golden_trajectories"
+    if not os.path.exists(experiment_name):
+        os.makedirs(experiment_name)
+
+    settings = dict(
+        experiment_name=experiment_name,
+        enemies=[enemies[0]],
+        playermode="ai",
+        player_controller=player_controller(10),
+        enemymode="static",
+        level=2,
+        speed="fastest",
+        randomini="yes",
+        logs="off",
+        savelogs="no",
+        render=render,
+    )
+    genomes = [np.loadtxt(f) for f in genome_files]
+    if batch:
+        env = BatchEnvironment(len(genomes) * len(seeds), **settings)
+    else:
+        env = Environment(**settings)
+
+    if mode == "record":
+        trajectories = record(env, genomes, enemies, seeds)
+        save(golden_file, trajectories)
+        frames = sum(len(t["time"]) for t in trajectories.values())
+        print("recorded %d episodes, %d frames" % (len(trajectories), frames))
+    else:
+        divergences = check(env, genomes, load(golden_file))
+        for name, (frame, field, expected, found) in sorted(divergences.items()):
+            print("%s: frame %d, %s: expected %s, found %s" % (name, frame, field, expected, found))
+        if divergences:
+            sys.exit(1)
+        print("all episodes match")
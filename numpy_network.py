@@ -0,0 +1,84 @@
+# vectorised replacement for neat.nn.FeedForwardNetwork.
+# the genome is compiled into one weight matrix per feed-forward layer, so activating
+# the network is a matrix product per layer instead of a python loop over every link.
+# only the node functions used in config-feedforward.txt (sum aggregation and sigmoid
+# activation) are supported; outputs match FeedForwardNetwork.activate up to float rounding.
+import numpy as np
+from neat.graphs import feed_forward_layers
+
+
+class NumpyNetwork(object):
+    def __init__(self, n_inputs, outputs, layers, n_values):
+        self.n_inputs = n_inputs
+        self.outputs = outputs  # indexes of the output nodes in 'values'
+        self.layers = layers  # (node indexes, weights, biases, responses) per layer
+        self.values = np.zeros(n_values)
+
+    def activate(self, inputs):
+        if len(inputs) != self.n_inputs:
+            raise RuntimeError(
+                "Expected {0:n} inputs, got {1:n}".format(self.n_inputs, len(inputs))
+            )
+
+        values = self.values
+        values[: self.n_inputs] = inputs
+        for nodes, weights, biases, responses in self.layers:
+            # same as neat's sigmoid_activation, applied to the whole layer at once
+            z = np.clip(5.0 * (biases + responses * weights.dot(values)), -60.0, 60.0)
+            values[nodes] = 1.0 / (1.0 + np.exp(-z))
+
+        return values[self.outputs]
+
+    @staticmethod
+    def create(genome, config):
+        """Receives a genome and returns its phenotype (a NumpyNetwork)."""
+        genome_config = config.genome_config
+
+        # gathers expressed connections
+        connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+
+        layers = feed_forward_layers(
+            genome_config.input_keys, genome_config.output_keys, connections
+        )
+
+        # position of every node in the values vector: inputs, outputs, then hidden nodes
+        index = {}
+        for key in genome_config.input_keys + genome_config.output_keys:
+            index[key] = len(index)
+        for layer in layers:
+            for node in layer:
+                if node not in index:
+                    index[node] = len(index)
+
+        compiled = []
+        for layer in layers:
+            nodes = sorted(layer, key=index.get)
+            row = dict((node, r) for r, node in enumerate(nodes))
+            weights = np.zeros((len(nodes), len(index)))
+            biases = np.zeros(len(nodes))
+            responses = np.zeros(len(nodes))
+
+            for r, node in enumerate(nodes):
+                ng = genome.nodes[node]
+                if ng.aggregation != "sum" or ng.activation != "sigmoid":
+                    raise ValueError(
+                        "NumpyNetwork supports only sum aggregation and sigmoid activation, "
+                        "node {0} uses {1} and {2}".format(
+                            node, ng.aggregation, ng.activation
+                        )
+                    )
+                biases[r] = ng.bias
+                responses[r] = ng.response
+
+            for inode, onode in connections:
+                if onode in row:
+                    weights[row[onode], index[inode]] = genome.connections[
+                        inode, onode
+                    ].weight
+
+            compiled.append(
+                (np.array([index[n] for n in nodes]), weights, biases, responses)
+            )
+
+        outputs = np.array([index[key] for key in genome_config.output_keys])
+        return NumpyNetwork(len(genome_config.input_keys), outputs, compiled, len(index))
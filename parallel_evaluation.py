@@ -0,0 +1,227 @@
+# parallel evaluation of populations over a pool of worker processes.
+# pygame keeps its state per process, so every worker builds its own Environment
+# once (through 'env_factory') and reuses it for all the individuals it plays.
+# 'env_factory' and the evaluation function must be picklable, i.e. defined at module level.
+# only what the evaluation function returns comes back from the workers: anything else
+# from the game (like env.stopped, the early stops) must be returned by it to be seen.
+import os
+import zlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+# environment owned by the current worker process
+_env = None
+
+
+def _init_worker(env_factory):
+    global _env
+    # workers never show the game
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    _env = env_factory()
+
+
+def _evaluate(func, individual, seed):
+    # seeds the episode randomness (random initial positions, random attacks)
+    _env.set_random(seed)
+    return func(individual, _env)
+
+
+def individual_seed(individual, base_seed=0):
+    # the seed depends only on the genes, so an individual gets the same episode
+    # no matter which worker plays it, or in which order
+    genes = np.ascontiguousarray(individual, dtype=np.float64)
+    return zlib.crc32(genes.tobytes(), base_seed)
+
+
+def common_seeds(k, generation=0, base_seed=0):
+    # k seeds shared by all the individuals of a generation (common random numbers)
+    return [zlib.crc32(b"%d %d" % (generation, i), base_seed) for i in range(k)]
+
+
+def aggregate(results, statistic=np.mean):
+    # applies 'statistic' (which takes an axis, like np.mean or np.median) to the results
+    # of the games of an individual, value by value when they are tuples
+    values = statistic(np.asarray(results, dtype=float), axis=0)
+    if isinstance(results[0], tuple):
+        return tuple(float(v) for v in values)
+    return float(values)
+
+
+class ParallelEvaluator(object):
+    """Evaluates individuals on a pool of worker processes, each one with its own Environment.
+
+    'map' follows the builtin map signature so it can be registered as the DEAP
+    toolbox map; the evaluation function is called as func(individual, env) and
+    results come back in input order. Workers that die are replaced and their
+    pending individuals played again, up to 'max_restarts' times per call.
+    With processes=1 everything runs in the current process, with the same seeding.
+    With a FitnessCache ('cache'), individuals already evaluated are not played again,
+    and identical individuals in one call are played only once.
+
+    With 'seeds' (common random numbers, see common_seeds), every individual plays
+    once with each of those seeds instead of once with a seed of its own, and its
+    result is the 'statistic' of them (see aggregate). All the games are spread over
+    the workers. 'seeds' can be changed between calls, e.g. once per generation.
+    """
+
+    def __init__(
+        self,
+        env_factory,
+        processes=None,
+        base_seed=0,
+        max_restarts=3,
+        cache=None,
+        seeds=None,
+        statistic=np.mean,
+    ):
+        self.env_factory = env_factory
+        self.processes = processes or os.cpu_count()
+        self.base_seed = base_seed
+        self.max_restarts = max_restarts
+        self.cache = cache
+        self.seeds = seeds
+        self.statistic = statistic
+        self.pool = None
+        self.env = None
+
+    def map(self, func, individuals):
+        # plain arrays pickle cheaply and do not depend on DEAP creator classes
+        individuals = [np.asarray(ind) for ind in individuals]
+        if self.cache is None:
+            return self._play(func, individuals)
+
+        # results on common seeds are only the same for the same seeds and statistic
+        extra = None
+        if self.seeds is not None:
+            extra = (list(self.seeds), self.statistic.__name__)
+
+        keys = [self.cache.key(ind, extra) for ind in individuals]
+        results = [self.cache.get(key) for key in keys]
+
+        # first position of every individual missing from the cache
+        missing = {}
+        for i, key in enumerate(keys):
+            if results[i] is None and key not in missing:
+                missing[key] = i
+
+        played = self._play(func, [individuals[i] for i in missing.values()])
+        played = dict(zip(missing, played))
+        for key, result in played.items():
+            self.cache.put(key, result)
+        self.cache.commit()
+
+        return [played[key] if r is None else r for key, r in zip(keys, results)]
+
+    # plays the individuals once each with a seed from their genes, or on the common seeds
+    def _play(self, func, individuals):
+        if self.seeds is None:
+            seeds = [individual_seed(ind, self.base_seed) for ind in individuals]
+            return self._run(func, individuals, seeds)
+        return self._run_common(func, individuals)
+
+    # plays every item with each of the common seeds and aggregates its results
+    def _run_common(self, func, items):
+        k = len(self.seeds)
+        results = self._run(
+            func,
+            [item for item in items for seed in self.seeds],
+            list(self.seeds) * len(items),
+        )
+        return [
+            aggregate(results[i * k : (i + 1) * k], self.statistic)
+            for i in range(len(items))
+        ]
+
+    def _run(self, func, items, seeds):
+        global _env
+
+        if self.processes == 1:
+            if self.env is None:
+                self.env = self.env_factory()
+            _env = self.env
+            return [_evaluate(func, item, s) for item, s in zip(items, seeds)]
+
+        results = [None] * len(items)
+        pending = list(range(len(items)))
+        restarts = 0
+        while pending:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    initializer=_init_worker,
+                    initargs=(self.env_factory,),
+                )
+            futures = [
+                (i, self.pool.submit(_evaluate, func, items[i], seeds[i]))
+                for i in pending
+            ]
+            failed = []
+            for i, future in futures:
+                try:
+                    results[i] = future.result()
+                except BrokenProcessPool:
+                    failed.append(i)
+
+            if failed:
+                # a worker crashed: the pool is unusable, so a fresh one is started
+                self.pool.shutdown(wait=False)
+                self.pool = None
+                restarts += 1
+                if restarts > self.max_restarts:
+                    raise RuntimeError(
+                        "worker processes crashed more than %d times" % self.max_restarts
+                    )
+            pending = failed
+
+        return results
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+
+class ParallelGenomeEvaluator(ParallelEvaluator):
+    """Drop-in replacement for the eval_genomes function given to neat.Population.run.
+
+    Genomes are played on the worker pool with func(genome, env) and their fitness
+    set in place. Episodes are seeded from the genome key, or played on the common
+    'seeds' as in ParallelEvaluator. The best, mean and std fitness of every
+    generation are appended to 'stats'.
+    """
+
+    def __init__(
+        self,
+        env_factory,
+        func,
+        processes=None,
+        base_seed=0,
+        max_restarts=3,
+        seeds=None,
+        statistic=np.mean,
+    ):
+        super(ParallelGenomeEvaluator, self).__init__(
+            env_factory,
+            processes,
+            base_seed,
+            max_restarts,
+            seeds=seeds,
+            statistic=statistic,
+        )
+        self.func = func
+        self.stats = []
+
+    def __call__(self, genomes, config):
+        genomes = [genome for genome_id, genome in genomes]
+
+        if self.seeds is None:
+            seeds = [zlib.crc32(str(g.key).encode(), self.base_seed) for g in genomes]
+            fitnesses = self._run(self.func, genomes, seeds)
+        else:
+            fitnesses = self._run_common(self.func, genomes)
+        for genome, fitness in zip(genomes, fitnesses):
+            genome.fitness = fitness
+
+        self.stats.append((np.max(fitnesses), np.mean(fitnesses), np.std(fitnesses)))
@@ -0,0 +1,164 @@
+# racing evaluation of the generalist fitness (cons_multi: mean - std of the fitness
+# against every enemy), for survivor selection keeping the best individuals (tools.selBest).
+# individuals play the enemies in rounds, one enemy per round, and an individual stops
+# playing as soon as enough others are sure to end with a better cons_multi than the
+# best it can still reach: it can not survive anyway. the survivors are the same as when
+# every individual plays every enemy.
+# every game is seeded from the genes and the enemy, so the results do not depend on
+# which games were played before, or on the order of the enemies.
+# how many games are saved depends on how loose the bounds are ('fitness_range') and on
+# the individuals already evaluated: their exact fitness raises the cutoff from the start.
+import zlib
+import numpy as np
+from parallel_evaluation import ParallelEvaluator, individual_seed
+
+
+# default consolidation of the results against multiple enemies (Environment.cons_multi).
+# the bounds below rely on it: a racing environment must not override cons_multi
+def cons_multi(values):
+    values = np.asarray(values, dtype=float)
+    return values.mean() - values.std()
+
+
+# lowest and highest cons_multi of n games that can follow the 'results' of the first
+# ones, when each of the remaining results is in [low, high]
+def cons_multi_bounds(results, n, low, high):
+
+    r = n - len(results)
+    if r == 0:
+        value = cons_multi(results)
+        return value, value
+
+    # mean - std is concave: its minimum is at a corner of the box of remaining results,
+    # where (by symmetry) only how many of them are 'high' matters
+    lower = min(
+        cons_multi(list(results) + [high] * k + [low] * (r - k)) for k in range(r + 1)
+    )
+
+    # and its maximum has (by symmetry) all the remaining results equal to some v.
+    # with a share q of the results known (mean a, variance s2) and p = 1 - q at v,
+    # cons_multi is q a + p v - sqrt(q s2 + q p (v - a)^2): it is highest at
+    # v = a + s / sqrt(q - p) when q > p, and only grows with v otherwise
+    v = high
+    if results:
+        q = len(results) / n
+        p = 1 - q
+        if q > p:
+            v = min(max(np.mean(results) + np.std(results) / np.sqrt(q - p), low), high)
+    upper = cons_multi(list(results) + [v] * r)
+
+    return lower, upper
+
+
+# plays the individual of 'item' (individual, enemy) against the enemy: returns the fitness
+def play_enemy(item, env):
+    individual, enemy = item
+    f, p, e, t = env.run_single(enemy, individual, "None")
+    return f
+
+
+class RacingEvaluator(ParallelEvaluator):
+    """Races individuals over 'enemies' to find the best ones, on the worker pool.
+
+    'race' returns the cons_multi of every individual that played all the enemies,
+    and the highest cons_multi it could still reach for every one that was stopped
+    ('complete' tells which ones). 'fitness_range' holds the lowest and highest
+    fitness_single of a game, the default one for every enemy with the default fitness.
+    Enemies are played in increasing order of their mean result in the previous race:
+    low results bring the best reachable cons_multi down the most, so the enemies
+    that beat most individuals stop most of them earliest.
+    Individuals that played every enemy are kept in the FitnessCache ('cache'), if any.
+    'map' evaluates as ParallelEvaluator does (one game seeded from the genes through
+    all the enemies), so its fitnesses are not those of 'race'.
+    """
+
+    def __init__(
+        self,
+        env_factory,
+        enemies,
+        processes=None,
+        base_seed=0,
+        max_restarts=3,
+        cache=None,
+        fitness_range=(-np.log(3000), 100.0),
+        **kwargs
+    ):
+        super(RacingEvaluator, self).__init__(
+            env_factory, processes, base_seed, max_restarts, cache, **kwargs
+        )
+        self.enemies = list(enemies)
+        self.fitness_range = fitness_range
+        self.means = {}  # enemy: mean of its results in the last race
+        self.complete = []
+        self.games = 0  # games played in all the races
+        self.skipped = 0  # games not played in all the races
+
+    # the seed of a game depends only on the genes and the enemy
+    def game_seed(self, individual, enemy):
+        return zlib.crc32(b"%d" % enemy, individual_seed(individual, self.base_seed))
+
+    def order(self):
+        return sorted(self.enemies, key=lambda e: self.means.get(e, 0.0))
+
+    # the results of an individual (enemy: fitness) in the order of 'enemies', whatever
+    # the order they were played in, so its cons_multi is always computed the same way
+    def in_order(self, results):
+        return [results[e] for e in self.enemies if e in results]
+
+    # races 'individuals' to find which ones are among the 'keep' best, together with
+    # individuals already evaluated, whose cons_multi are 'known'. with keep=None every
+    # individual plays every enemy: the fitnesses are the same, only no game is skipped
+    def race(self, individuals, keep=None, known=()):
+
+        individuals = [np.asarray(ind) for ind in individuals]
+        n = len(self.enemies)
+        low, high = self.fitness_range
+
+        results = [{} for ind in individuals]  # enemy: fitness, of every individual
+        bounds = [(low, high)] * len(individuals)
+        cached = [False] * len(individuals)
+
+        # the fitness of individuals that played every enemy before is exact
+        if self.cache is not None:
+            keys = [self.cache.key(ind, ("race", self.enemies)) for ind in individuals]
+            for i, key in enumerate(keys):
+                value = self.cache.get(key)
+                if value is not None:
+                    bounds[i] = (value, value)
+                    cached[i] = True
+        racing = [i for i in range(len(individuals)) if not cached[i]]
+
+        for enemy in self.order():
+            if not racing:
+                break
+
+            played = self._run(
+                play_enemy,
+                [(individuals[i], enemy) for i in racing],
+                [self.game_seed(individuals[i], enemy) for i in racing],
+            )
+            for i, f in zip(racing, played):
+                results[i][enemy] = f
+                bounds[i] = cons_multi_bounds(self.in_order(results[i]), n, low, high)
+            self.means[enemy] = float(np.mean(played))
+            self.games += len(racing)
+
+            # the 'keep'-th best cons_multi that is sure to be reached: individuals that
+            # can not reach it have at least 'keep' others ending better than them
+            lower = sorted([b[0] for b in bounds] + list(known), reverse=True)
+            if keep is None or len(lower) < keep:
+                continue
+            cutoff = lower[keep - 1]
+            racing = [i for i in racing if bounds[i][1] >= cutoff]
+
+        self.complete = [c or len(r) == n for c, r in zip(cached, results)]
+        self.skipped += sum(n - len(r) for c, r in zip(cached, results) if not c)
+
+        # only exact fitnesses are kept
+        if self.cache is not None:
+            for i, key in enumerate(keys):
+                if len(results[i]) == n:
+                    self.cache.put(key, bounds[i][1])
+            self.cache.commit()
+
+        return [upper for lower, upper in bounds]
@@ -9,6 +9,7 @@ import sys, os
 sys.path.insert(0, "evoman")
 from environment import Environment
 from controller import Controller
+from numpy_network import NumpyNetwork
 import numpy as np
 import neat
 import random
@@ -19,6 +20,7 @@ import pickle
 experiment_name = "dummy_NEAT_2"
 mode = "test"  # Either train or test. In case of test there should be a pickle file present
 generations = 100
+network = "neat"  # Either neat or numpy (vectorised network, same decisions and faster)
 if not os.path.exists(experiment_name):
     os.makedirs(experiment_name)
 
@@ -90,7 +92,10 @@ def run_from_solution(config_path, genome_path, enemy):
     genomes = [(1, genome)]
 
     # Load the one genome that is loaded
-    net = neat.nn.FeedForwardNetwork.create(genomes[0][1], config)
+    if network == "numpy":
+        net = NumpyNetwork.create(genomes[0][1], config)
+    else:
+        net = neat.nn.FeedForwardNetwork.create(genomes[0][1], config)
 
     # Call game with only the loaded genome
     env = Environment(
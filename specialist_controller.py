@@ -5,6 +5,8 @@
 # 'controller' could contain either weights to be used in the standard controller (or other controller implemented),
 # or even a full network structure (ex.: from NEAT).
 from controller import Controller
+from numpy_network import NumpyNetwork
+from collections import OrderedDict
 import numpy as np
 import neat
 import os
@@ -16,8 +18,9 @@ def sigmoid_activation(x):
 
 # implements controller structure for player
 # Uses custom nn coming from NEAT
+# network: "neat" (neat.nn.FeedForwardNetwork) or "numpy" (vectorised NumpyNetwork)
 class NEAT_Controls(Controller):
-    def __init__(self):
+    def __init__(self, cache_size=128, network="neat"):
         local_dir = os.path.dirname(__file__)
         config_file = os.path.join(local_dir, "config-feedforward.txt")
         config = neat.config.Config(
@@ -29,8 +32,32 @@ class NEAT_Controls(Controller):
         )
         self.config = config
 
+        if network == "numpy":
+            self.network_class = NumpyNetwork
+        else:
+            self.network_class = neat.nn.FeedForwardNetwork
+
+        # networks compiled for the last genomes played, least recently used first
+        self.cache_size = cache_size
+        self.networks = OrderedDict()
+
+    # compiles a genome only the first time it is played, not on every frame
+    def get_network(self, genome):
+        key = id(genome)
+        if key in self.networks:
+            self.networks.move_to_end(key)
+            return self.networks[key][1]
+
+        net = self.network_class.create(genome, self.config)
+
+        # keeps the genome referenced, so its id is not reused while it is cached
+        self.networks[key] = (genome, net)
+        if len(self.networks) > self.cache_size:
+            self.networks.popitem(last=False)
+        return net
+
     def control(self, sensor_data, genome):
-        net = neat.nn.FeedForwardNetwork.create(genome, self.config)
+        net = self.get_network(genome)
         output = net.activate(sensor_data)
         # takes decisions about sprite actions
         if output[0] > 0.5: